@@ -0,0 +1,168 @@
+# api_common.py - Web 服务（Flask 版 app.py 与 asyncio 版 asgi_app.py）共用的请求解析与处理逻辑
+
+import base64
+import binascii
+import os
+import brute_force
+import metrics
+import sdes
+import result_cache
+
+# 暴力破解请求的耗时上限（秒，0 表示不限制）；请求中的 timeout 只能更短
+BRUTE_TIMEOUT = float(os.environ.get('SDES_BRUTE_TIMEOUT', 0)) or None
+
+# 紧凑字节格式：(解码, 编码)
+BYTE_FORMATS = {
+    'hex': (bytes.fromhex, bytes.hex),
+    'base64': (lambda text: base64.b64decode(text, validate=True),
+               lambda data: base64.b64encode(data).decode('ascii')),
+}
+
+_BIN_STRINGS = [f"{b:08b}" for b in range(256)]
+
+
+def valid_key(key):
+    """密钥需为 10 位二进制字符串"""
+    return isinstance(key, str) and len(key) == 10 and set(key) <= {'0', '1'}
+
+
+def crypt_item(data, decrypt, cipher=None):
+    """处理单个加解密请求体，返回 (result, error, status)；cipher 为已解析好的同密钥加解密器"""
+    mode = data.get('mode', 'binary')
+    fmt = data.get('format', mode)
+    key = data.get('key', '')
+    text = data.get('text', '')
+
+    if cipher is None:
+        if not valid_key(key):
+            return None, '密钥必须是10位二进制', 400
+        cipher = sdes.get_cipher(key)
+    if not isinstance(text, str):
+        return None, 'text 必须是字符串', 400
+
+    op = 'decrypt' if decrypt else 'encrypt'
+    try:
+        crypt = cipher.decrypt_bytes if decrypt else cipher.encrypt_bytes
+        if fmt in BYTE_FORMATS:
+            decode, encode = BYTE_FORMATS[fmt]
+            try:
+                raw = decode(text)
+            except (ValueError, binascii.Error):
+                return None, f'{fmt} 输入格式错误', 400
+            metrics.BYTES_PROCESSED.inc(len(raw), op=op)
+            return encode(crypt(raw)), None, 200
+        if fmt == 'binary':
+            bits = ''.join(text.split())
+            if not bits or len(bits) % 8 != 0 or not set(bits) <= {'0', '1'}:
+                return None, '二进制输入需为8的倍数，且仅含0/1', 400
+            metrics.BYTES_PROCESSED.inc(len(bits) // 8, op=op)
+            out = crypt(int(bits, 2).to_bytes(len(bits) // 8, 'big'))
+            return ' '.join([_BIN_STRINGS[b] for b in out]), None, 200
+        # ascii
+        try:
+            if decrypt:
+                result = sdes.decrypt_text(text, cipher.key)
+            else:
+                result = sdes.encrypt_text(text, cipher.key)
+        except UnicodeDecodeError:
+            return None, '解密结果不是合法的 UTF-8 文本（密钥或密文错误）', 400
+        except UnicodeError:
+            if decrypt:
+                return None, 'ASCII 模式密文字符须在 0~255 之间', 400
+            return None, '明文包含无法编码的字符', 400
+        metrics.BYTES_PROCESSED.inc(len(text), op=op)
+        return result, None, 200
+    except Exception as e:
+        return None, str(e), 500
+
+
+def parse_pairs(pairs_raw):
+    """解析多行 "PT CT" 文本，返回 (pairs, error)"""
+    pairs = []
+    for line in pairs_raw.split('\n'):
+        line = line.strip()
+        if not line:
+            continue
+        parts = line.split()
+        if len(parts) != 2:
+            return None, f"格式错误: '{line}' 应为: PT CT"
+        pt, ct = parts
+        if len(pt) != 8 or len(ct) != 8 or any(c not in '01' for c in pt+ct):
+            return None, f"位串错误: '{line}'，PT/CT需为8位二进制"
+        pairs.append((pt, ct))
+
+    if not pairs:
+        return None, '至少提供一行明密文对'
+    return pairs, None
+
+
+def parse_brute_backend(data, default_backend):
+    """解析暴力破解的 threads / backend，返回 (threads, backend, error)"""
+    try:
+        threads = max(1, int(data.get('threads', 1)))
+    except (TypeError, ValueError):
+        return None, None, 'threads 必须是整数'
+    backend = data.get('backend', default_backend)
+    if backend not in brute_force.BACKENDS:
+        return None, None, f"backend 必须是 {', '.join(brute_force.BACKENDS)} 之一"
+    return threads, backend, None
+
+
+def parse_brute_options(data):
+    """解析暴力破解的 timeout / first_match_only，返回 (timeout, first_match_only, error)"""
+    timeout = data.get('timeout')
+    if timeout is not None:
+        try:
+            timeout = float(timeout)
+        except (TypeError, ValueError):
+            return None, False, 'timeout 必须是数字（秒）'
+        if timeout <= 0:
+            return None, False, 'timeout 必须大于 0'
+    if BRUTE_TIMEOUT is not None:
+        timeout = BRUTE_TIMEOUT if timeout is None else min(timeout, BRUTE_TIMEOUT)
+    first_match_only = data.get('first_match_only', False)
+    if not isinstance(first_match_only, bool):
+        return None, False, 'first_match_only 必须是 true 或 false'
+    return timeout, first_match_only, None
+
+
+def brute_result(pairs, result):
+    """暴力破解响应体：匹配密钥 + 逐个验证结果；result 为 brute_force.BruteForceResult"""
+    verify = []
+    for k in result.keys:
+        ok = all(sdes.encrypt(pt, k) == ct for pt, ct in pairs)
+        verify.append({'key': k, 'ok': ok})
+    return {
+        'keys': result.keys,
+        'verify': verify,
+        'elapsed': result.elapsed,
+        'count': len(result.keys),
+        'tried': result.tried,
+        'cancelled': result.cancelled,
+        'timed_out': result.timed_out,
+    }
+
+
+def make_result_cache():
+    """按环境变量创建结果缓存：SDES_CACHE_BYTES、SDES_CACHE_TTL、SDES_CACHE_PATH（磁盘后备，可选）"""
+    return result_cache.ResultCache(
+        max_bytes=int(os.environ.get('SDES_CACHE_BYTES', 64 * 1024 * 1024)),
+        ttl=float(os.environ.get('SDES_CACHE_TTL', 300)),
+        path=os.environ.get('SDES_CACHE_PATH') or None,
+    )
+
+
+def cached_crypt_item(cache, data, decrypt):
+    """带缓存的 crypt_item：只缓存成功结果"""
+    fmt = data.get('format', data.get('mode', 'binary'))
+    text = data.get('text', '')
+    if not isinstance(text, str):
+        return crypt_item(data, decrypt)
+    cache_key = result_cache.crypt_cache_key('decrypt' if decrypt else 'encrypt', data.get('key', ''), fmt, text)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached, None, 200
+    result, error, status = crypt_item(data, decrypt)
+    if not error:
+        cache.put(cache_key, result)
+    return result, error, status
@@ -1,99 +1,244 @@
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, g, request, jsonify, send_from_directory, stream_with_context
 import os
+import time
 import sdes
+import api_common
 import brute_force
+import jobs
+import key_index
+import metrics
+import modes
+import result_cache
 
 app = Flask(__name__, static_folder='static', template_folder='templates')
 
+# 重复请求的结果缓存
+cache = api_common.make_result_cache()
+
+# 后台暴力破解任务：共享有界线程池 + 排队上限
+job_manager = jobs.JobManager(
+    workers=int(os.environ.get('SDES_JOB_WORKERS', 2)),
+    max_pending=int(os.environ.get('SDES_JOB_QUEUE', 32)),
+)
+
+
+@app.before_request
+def _start_timer():
+    g.start_time = time.perf_counter()
+
+
+@app.after_request
+def _record_request(response):
+    """按路由模板记录请求数与耗时（流式响应记录的是首字节前的耗时）"""
+    route = request.url_rule.rule if request.url_rule else 'unmatched'
+    metrics.REQUESTS.inc(route=route, method=request.method, status=response.status_code)
+    if 'start_time' in g:
+        metrics.LATENCY.observe(time.perf_counter() - g.start_time, route=route)
+    return response
+
+
+@app.route('/metrics')
+def metrics_endpoint():
+    metrics.update_service_gauges(cache, {
+        'brute_force': brute_force.queue_depth(),
+        'jobs': job_manager.queue_depth(),
+    })
+    return Response(metrics.render(), content_type=metrics.CONTENT_TYPE)
+
 
 @app.route('/')
 def index():
     return send_from_directory('templates', 'index.html')
 
 
-@app.route('/api/encrypt', methods=['POST'])
-def api_encrypt():
-    data = request.get_json(force=True)
-    mode = data.get('mode', 'binary')
-    key = data.get('key', '')
-    text = data.get('text', '')
-
-    if not key or len(key) != 10 or any(c not in '01' for c in key):
+def _raw_crypt(decrypt):
+    """application/octet-stream：请求体为原始字节，密钥放在查询参数 key 中，响应为原始字节"""
+    key = request.args.get('key', '')
+    if not api_common.valid_key(key):
         return jsonify({'error': '密钥必须是10位二进制'}), 400
+    cipher = sdes.get_cipher(key)
+    body = request.get_data()
+    metrics.BYTES_PROCESSED.inc(len(body), op='decrypt' if decrypt else 'encrypt')
+    out = cipher.decrypt_bytes(body) if decrypt else cipher.encrypt_bytes(body)
+    return Response(out, mimetype='application/octet-stream')
 
-    try:
-        if mode == 'binary':
-            bits = ''.join(text.split())
-            if not bits or len(bits) % 8 != 0 or any(c not in '01' for c in bits):
-                return jsonify({'error': '二进制输入需为8的倍数，且仅含0/1'}), 400
-            out_blocks = []
-            for i in range(0, len(bits), 8):
-                out_blocks.append(sdes.encrypt(bits[i:i+8], key))
-            return jsonify({'result': ' '.join(out_blocks)})
-        else:
-            # ascii
-            cipher = sdes.encrypt_text(text, key)
-            return jsonify({'result': cipher})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+
+def _json_crypt(decrypt):
+    """JSON 请求：mode 为 binary/ascii，或用 format 指定 hex/base64 紧凑字节格式"""
+    result, error, status = api_common.cached_crypt_item(cache, request.get_json(force=True), decrypt)
+    if error:
+        return jsonify({'error': error}), status
+    return jsonify({'result': result})
+
+
+@app.route('/api/encrypt', methods=['POST'])
+def api_encrypt():
+    if request.mimetype == 'application/octet-stream':
+        return _raw_crypt(decrypt=False)
+    return _json_crypt(decrypt=False)
 
 
 @app.route('/api/decrypt', methods=['POST'])
 def api_decrypt():
-    data = request.get_json(force=True)
-    mode = data.get('mode', 'binary')
-    key = data.get('key', '')
-    text = data.get('text', '')
+    if request.mimetype == 'application/octet-stream':
+        return _raw_crypt(decrypt=True)
+    return _json_crypt(decrypt=True)
+
+
+STREAM_CHUNK_SIZE = 64 * 1024
 
-    if not key or len(key) != 10 or any(c not in '01' for c in key):
-        return jsonify({'error': '密钥必须是10位二进制'}), 400
 
+def _stream_crypt(decrypt):
+    """分块读取 request.stream，经流式工作模式处理后以生成器逐块返回，内存占用与数据大小无关"""
+    key = request.args.get('key', '')
+    mode = request.args.get('mode', 'ecb')
+    if not api_common.valid_key(key):
+        return jsonify({'error': '密钥必须是10位二进制'}), 400
+    if mode not in modes.MODES:
+        return jsonify({'error': f"mode 必须是 {', '.join(modes.MODES)} 之一"}), 400
     try:
-        if mode == 'binary':
-            bits = ''.join(text.split())
-            if not bits or len(bits) % 8 != 0 or any(c not in '01' for c in bits):
-                return jsonify({'error': '二进制输入需为8的倍数，且仅含0/1'}), 400
-            out_blocks = []
-            for i in range(0, len(bits), 8):
-                out_blocks.append(sdes.decrypt(bits[i:i+8], key))
-            return jsonify({'result': ' '.join(out_blocks)})
+        iv = int(request.args.get('iv', '0'), 0)
+        ctx = (modes.decryptor if decrypt else modes.encryptor)(key, mode, iv)
+    except ValueError:
+        return jsonify({'error': 'IV 必须在 0~255 之间'}), 400
+
+    stream = request.stream
+    op = 'decrypt' if decrypt else 'encrypt'
+
+    def generate():
+        while True:
+            chunk = stream.read(STREAM_CHUNK_SIZE)
+            if not chunk:
+                break
+            metrics.BYTES_PROCESSED.inc(len(chunk), op=op)
+            yield ctx.update(chunk)
+        tail = ctx.finalize()
+        if tail:
+            yield tail
+
+    return Response(stream_with_context(generate()), mimetype='application/octet-stream')
+
+
+@app.route('/api/stream/encrypt', methods=['POST'])
+def api_stream_encrypt():
+    return _stream_crypt(decrypt=False)
+
+
+@app.route('/api/stream/decrypt', methods=['POST'])
+def api_stream_decrypt():
+    return _stream_crypt(decrypt=True)
+
+
+MAX_BATCH_ITEMS = int(os.environ.get('SDES_BATCH_LIMIT', 10000))
+
+
+@app.route('/api/batch', methods=['POST'])
+def api_batch():
+    """批量加解密：items 为 [{op, key, mode/format, text}, ...]，按密钥分组处理，结果按原顺序返回"""
+    data = request.get_json(force=True)
+    items = data.get('items') if isinstance(data, dict) else data
+    if not isinstance(items, list):
+        return jsonify({'error': '请求体需为数组，或包含 items 数组'}), 400
+    if len(items) > MAX_BATCH_ITEMS:
+        return jsonify({'error': f'单次最多 {MAX_BATCH_ITEMS} 项'}), 413
+
+    results = [None] * len(items)
+    groups = {}
+    for i, item in enumerate(items):
+        if not isinstance(item, dict):
+            results[i] = {'error': '每一项必须是对象'}
+        elif item.get('op', 'encrypt') not in ('encrypt', 'decrypt'):
+            results[i] = {'error': "op 必须是 encrypt 或 decrypt"}
+        elif not api_common.valid_key(item.get('key', '')):
+            results[i] = {'error': '密钥必须是10位二进制'}
         else:
-            plain = sdes.decrypt_text(text, key)
-            return jsonify({'result': plain})
-    except Exception as e:
-        return jsonify({'error': str(e)}), 500
+            groups.setdefault(item['key'], []).append(i)
+
+    # 每个密钥只解析一次子密钥/码本行
+    for key, indices in groups.items():
+        cipher = sdes.get_cipher(key)
+        for i in indices:
+            item = items[i]
+            text = item.get('text', item.get('data', ''))
+            result, error, _ = api_common.crypt_item(dict(item, text=text), item.get('op', 'encrypt') == 'decrypt', cipher)
+            results[i] = {'error': error} if error else {'result': result}
+
+    errors = sum(1 for r in results if 'error' in r)
+    return jsonify({'results': results, 'count': len(results), 'errors': errors})
 
 
 @app.route('/api/brute', methods=['POST'])
 def api_bruteforce():
     data = request.get_json(force=True)
     pairs_raw = data.get('pairs', '')  # multiline: "PT CT" per line
-    threads = int(data.get('threads', 1))
-
-    pairs = []
-    for line in pairs_raw.split('\n'):
-        line = line.strip()
-        if not line:
-            continue
-        parts = line.split()
-        if len(parts) != 2:
-            return jsonify({'error': f"格式错误: '{line}' 应为: PT CT"}), 400
-        pt, ct = parts
-        if len(pt) != 8 or len(ct) != 8 or any(c not in '01' for c in pt+ct):
-            return jsonify({'error': f"位串错误: '{line}'，PT/CT需为8位二进制"}), 400
-        pairs.append((pt, ct))
-
-    if not pairs:
-        return jsonify({'error': '至少提供一行明密文对'}), 400
-
-    keys, elapsed = brute_force.brute_force_multi(pairs, threads=max(1, threads))
+    threads, backend, error = api_common.parse_brute_backend(data, 'thread')
+    if error:
+        return jsonify({'error': error}), 400
+
+    pairs, error = api_common.parse_pairs(pairs_raw)
+    if error:
+        return jsonify({'error': error}), 400
+    timeout, first_match_only, error = api_common.parse_brute_options(data)
+    if error:
+        return jsonify({'error': error}), 400
+
+    # 只缓存完整搜索的结果
+    cache_key = None if first_match_only else result_cache.brute_cache_key(pairs)
+    cached = cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return jsonify(cached)
+
+    # 首个破解请求时在当前 worker 内构建 (明文, 密文) -> 密钥 倒排索引，之后直接查索引
+    # （不在导入时起后台线程，预先 fork 的服务器下线程不会被子进程继承）
+    if not key_index.is_built():
+        key_index.build()
+
+    try:
+        with brute_force.admit():
+            outcome = brute_force.brute_force_multi(pairs, threads=threads, backend=backend,
+                                                    timeout=timeout, first_match_only=first_match_only)
+    except brute_force.BruteForceBusy:
+        return jsonify({'error': '破解请求过多，请稍后重试'}), 429
+    metrics.record_brute_force(outcome.tried, outcome.elapsed)
     # 验证
-    verify = []
-    for k in keys:
-        ok = all(sdes.encrypt(pt, k) == ct for pt, ct in pairs)
-        verify.append({'key': k, 'ok': ok})
+    result = api_common.brute_result(pairs, outcome)
+    if cache_key and not outcome.cancelled:
+        cache.put(cache_key, result)
+    return jsonify(result)
 
-    return jsonify({'keys': keys, 'verify': verify, 'elapsed': elapsed, 'count': len(keys)})
+
+@app.route('/api/cache/stats', methods=['GET'])
+def api_cache_stats():
+    return jsonify(cache.stats())
+
+
+@app.route('/api/brute/jobs', methods=['POST'])
+def api_brute_job_create():
+    data = request.get_json(force=True)
+    pairs, error = api_common.parse_pairs(data.get('pairs', ''))
+    if error:
+        return jsonify({'error': error}), 400
+    try:
+        job = job_manager.submit(pairs)
+    except jobs.JobQueueFull:
+        return jsonify({'error': '任务队列已满，请稍后重试'}), 429
+    return jsonify(job.to_dict()), 202
+
+
+@app.route('/api/brute/jobs/<job_id>', methods=['GET'])
+def api_brute_job_status(job_id):
+    job = job_manager.get(job_id)
+    if job is None:
+        return jsonify({'error': '任务不存在'}), 404
+    return jsonify(job.to_dict())
+
+
+@app.route('/api/brute/jobs/<job_id>', methods=['DELETE'])
+def api_brute_job_cancel(job_id):
+    job = job_manager.cancel(job_id)
+    if job is None:
+        return jsonify({'error': '任务不存在'}), 404
+    return jsonify(job.to_dict())
 
 
 @app.route('/static/<path:path>')
@@ -0,0 +1,224 @@
+# asgi_app.py - S-DES Web 服务的 asyncio / ASGI 版本
+# 与 app.py 提供相同的 /api/encrypt、/api/decrypt（JSON 与 application/octet-stream）、/api/brute、/metrics 接口约定，
+# 不依赖任何 Web 框架；/api/brute 未指定 backend 时默认 process（Flask 版默认 thread）。
+# 小的加解密请求直接在事件循环中处理；暴力破解通过 run_in_executor 交给共享进程池，
+# 连接由 ASGI 服务器以协程承载，慢客户端不会各占一个线程。
+# 运行：uvicorn asgi_app:app --workers 4
+
+import asyncio
+import functools
+import json
+import os
+import time
+from urllib.parse import parse_qs
+
+import api_common
+import brute_force
+import key_index
+import metrics
+import result_cache
+import sdes
+
+MAX_BODY_SIZE = int(os.environ.get('SDES_MAX_BODY', 16 * 1024 * 1024))
+
+# 重复请求的结果缓存
+cache = api_common.make_result_cache()
+
+
+class HTTPError(Exception):
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+async def _read_body(receive) -> bytes:
+    body = bytearray()
+    while True:
+        message = await receive()
+        if message['type'] == 'http.disconnect':
+            raise HTTPError(400, '客户端已断开')
+        body += message.get('body', b'')
+        if len(body) > MAX_BODY_SIZE:
+            raise HTTPError(413, '请求体过大')
+        if not message.get('more_body'):
+            return bytes(body)
+
+
+async def _read_json(receive) -> dict:
+    try:
+        data = json.loads(await _read_body(receive) or b'{}')
+    except ValueError:
+        raise HTTPError(400, '请求体不是合法的 JSON')
+    if not isinstance(data, dict):
+        raise HTTPError(400, '请求体必须是 JSON 对象')
+    return data
+
+
+async def _send_json(send, payload, status=200):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': status,
+        'headers': [(b'content-type', b'application/json; charset=utf-8'),
+                    (b'content-length', str(len(body)).encode('ascii'))],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+def _content_type(scope) -> str:
+    for name, value in scope.get('headers', ()):
+        if name == b'content-type':
+            return value.decode('latin-1').split(';', 1)[0].strip().lower()
+    return ''
+
+
+def _query_param(scope, name, default=''):
+    values = parse_qs(scope.get('query_string', b'').decode('latin-1')).get(name)
+    return values[0] if values else default
+
+
+async def _raw_crypt(scope, receive, decrypt):
+    """application/octet-stream：请求体为原始字节，密钥放在查询参数 key 中，响应为原始字节"""
+    key = _query_param(scope, 'key')
+    if not api_common.valid_key(key):
+        return {'error': '密钥必须是10位二进制'}, 400
+    cipher = sdes.get_cipher(key)
+    body = await _read_body(receive)
+    metrics.BYTES_PROCESSED.inc(len(body), op='decrypt' if decrypt else 'encrypt')
+    return (cipher.decrypt_bytes(body) if decrypt else cipher.encrypt_bytes(body)), 200
+
+
+async def _send_bytes(send, body):
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', b'application/octet-stream'),
+                    (b'content-length', str(len(body)).encode('ascii'))],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+async def api_crypt(scope, receive, decrypt):
+    if _content_type(scope) == 'application/octet-stream':
+        return await _raw_crypt(scope, receive, decrypt)
+    result, error, status = api_common.cached_crypt_item(cache, await _read_json(receive), decrypt)
+    if error:
+        return {'error': error}, status
+    return {'result': result}, 200
+
+
+async def api_encrypt(scope, receive):
+    return await api_crypt(scope, receive, decrypt=False)
+
+
+async def api_decrypt(scope, receive):
+    return await api_crypt(scope, receive, decrypt=True)
+
+
+async def api_bruteforce(scope, receive):
+    data = await _read_json(receive)
+    # 未指定 backend 时默认用共享进程池（Flask 版默认 thread）
+    threads, backend, error = api_common.parse_brute_backend(data, 'process')
+    if error:
+        return {'error': error}, 400
+    pairs, error = api_common.parse_pairs(data.get('pairs', ''))
+    if error:
+        return {'error': error}, 400
+    timeout, first_match_only, error = api_common.parse_brute_options(data)
+    if error:
+        return {'error': error}, 400
+    threads = min(threads, brute_force.POOL_WORKERS)
+
+    # 只缓存完整搜索的结果
+    cache_key = None if first_match_only else result_cache.brute_cache_key(pairs)
+    cached = cache.get(cache_key) if cache_key else None
+    if cached is not None:
+        return cached, 200
+
+    search = functools.partial(brute_force.brute_force_multi, pairs, threads=threads, backend=backend,
+                               timeout=timeout, first_match_only=first_match_only)
+    if key_index.is_built():
+        outcome = search()
+    else:
+        # 分片在共享进程池中计算，等待与超时检查在默认线程池中进行，事件循环不阻塞
+        try:
+            with brute_force.admit():
+                outcome = await asyncio.get_running_loop().run_in_executor(None, search)
+        except brute_force.BruteForceBusy:
+            return {'error': '破解请求过多，请稍后重试'}, 429
+    metrics.record_brute_force(outcome.tried, outcome.elapsed)
+    result = api_common.brute_result(pairs, outcome)
+    if cache_key and not outcome.cancelled:
+        cache.put(cache_key, result)
+    return result, 200
+
+
+async def _send_metrics(send):
+    metrics.update_service_gauges(cache, {'brute_force': brute_force.queue_depth()})
+    body = metrics.render().encode('utf-8')
+    await send({
+        'type': 'http.response.start',
+        'status': 200,
+        'headers': [(b'content-type', metrics.CONTENT_TYPE.encode('ascii')),
+                    (b'content-length', str(len(body)).encode('ascii'))],
+    })
+    await send({'type': 'http.response.body', 'body': body})
+
+
+ROUTES = {
+    ('POST', '/api/encrypt'): api_encrypt,
+    ('POST', '/api/decrypt'): api_decrypt,
+    ('POST', '/api/brute'): api_bruteforce,
+}
+
+
+async def _lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message['type'] == 'lifespan.startup':
+            key_index.warm_up()
+            await send({'type': 'lifespan.startup.complete'})
+        elif message['type'] == 'lifespan.shutdown':
+            await send({'type': 'lifespan.shutdown.complete'})
+            return
+
+
+async def app(scope, receive, send):
+    """ASGI 入口"""
+    if scope['type'] == 'lifespan':
+        return await _lifespan(receive, send)
+    if scope['type'] != 'http':
+        return
+    start = time.perf_counter()
+    method, path = scope['method'], scope['path']
+    route = path
+    if method == 'GET' and path == '/metrics':
+        status = 200
+        await _send_metrics(send)
+    else:
+        handler = ROUTES.get((method, path))
+        if handler is None:
+            if any(p == path for _, p in ROUTES):
+                payload, status = {'error': '不支持的请求方法'}, 405
+            else:
+                payload, status, route = {'error': '未找到'}, 404, 'unmatched'
+        else:
+            try:
+                payload, status = await handler(scope, receive)
+            except HTTPError as e:
+                payload, status = {'error': e.message}, e.status
+            except Exception as e:
+                payload, status = {'error': str(e)}, 500
+        if isinstance(payload, bytes):
+            await _send_bytes(send, payload)
+        else:
+            await _send_json(send, payload, status)
+    metrics.REQUESTS.inc(route=route, method=method, status=status)
+    metrics.LATENCY.observe(time.perf_counter() - start, route=route)
+
+
+if __name__ == '__main__':
+    import uvicorn
+    uvicorn.run('asgi_app:app', host='0.0.0.0', port=int(os.environ.get('PORT', 8000)),
+                workers=int(os.environ.get('WEB_CONCURRENCY', 1)))
@@ -0,0 +1,49 @@
+# bench_brute.py - 暴力破解与碰撞分析基准
+# brute_force_multi 按 后端 × 并行度 × 明密文对数 组合测量；遍历用例关闭倒排索引，索引查询单独测量。
+
+import contextlib
+import io
+
+import harness  # noqa: F401
+from harness import Case
+
+import brute_force
+import codebook
+import collision_analysis
+import key_index
+import sdes
+
+KEY = "1100110011"
+PLAINTEXTS = ("10101010", "11110000", "00000001", "01100110")
+THREAD_COUNTS = (1, 2, 4)
+PAIR_COUNTS = (1, 2, 4)
+
+
+def _pairs(n):
+    return [(pt, sdes.encrypt(pt, KEY)) for pt in PLAINTEXTS[:n]]
+
+
+def _collision_analysis():
+    with contextlib.redirect_stdout(io.StringIO()):
+        collision_analysis.main()
+
+
+def cases(quick=False):
+    pt, ct = _pairs(1)[0]
+    yield Case('brute.brute_force', lambda: brute_force.brute_force(pt, ct), 'brute',
+               setup=codebook.encrypt_codebook)
+
+    thread_counts = THREAD_COUNTS[:2] if quick else THREAD_COUNTS
+    for n_pairs in PAIR_COUNTS:
+        pairs = _pairs(n_pairs)
+        for backend in brute_force.BACKENDS:
+            for threads in (1,) if backend == "inline" else thread_counts:
+                yield Case(f'brute.multi[{backend},threads={threads},pairs={n_pairs}]',
+                           lambda p=pairs, b=backend, t=threads:
+                               brute_force.brute_force_multi(p, threads=t, backend=b, use_index=False),
+                           'brute', params={'backend': backend, 'threads': threads, 'pairs': n_pairs})
+        yield Case(f'brute.multi[index,pairs={n_pairs}]',
+                   lambda p=pairs: brute_force.brute_force_multi(p),
+                   'brute', params={'backend': 'index', 'pairs': n_pairs}, setup=key_index.build)
+
+    yield Case('analysis.collision_analysis', _collision_analysis, 'analysis')
@@ -0,0 +1,33 @@
+# bench_core.py - 核心算法基准：单分组加解密、子密钥生成、文本吞吐量
+
+import os
+
+import harness  # noqa: F401  (把 S-DES 目录加入 sys.path)
+from harness import Case
+
+import sdes
+
+KEY = "1100110011"
+BLOCK = "10101010"
+TEXT_SIZES = (1 << 10, 64 << 10, 1 << 20)
+
+
+def _text(size):
+    # 可打印 ASCII，utf-8 编码后字节数与字符数相同
+    return ''.join(chr(32 + b % 95) for b in os.urandom(size))
+
+
+def cases(quick=False):
+    ciphertext = sdes.encrypt(BLOCK, KEY)
+    yield Case('core.encrypt_block', lambda: sdes.encrypt(BLOCK, KEY), 'core')
+    yield Case('core.decrypt_block', lambda: sdes.decrypt(ciphertext, KEY), 'core')
+    yield Case('core.generate_keys', lambda: sdes.generate_keys(KEY), 'core')
+    yield Case('core.encrypt_int', lambda: sdes.encrypt_int(0b10101010, 0b1100110011), 'core')
+
+    for size in TEXT_SIZES[:2] if quick else TEXT_SIZES:
+        text = _text(size)
+        encrypted = sdes.encrypt_text(text, KEY)
+        yield Case(f'core.encrypt_text[{size}]', lambda t=text: sdes.encrypt_text(t, KEY), 'core',
+                   params={'size': size}, nbytes=size)
+        yield Case(f'core.decrypt_text[{size}]', lambda c=encrypted: sdes.decrypt_text(c, KEY), 'core',
+                   params={'size': size}, nbytes=size)
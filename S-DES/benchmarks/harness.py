@@ -0,0 +1,150 @@
+# harness.py - 基准测试计时、机器信息采集与结果比较
+# 计时方式与 timeit 相同：先自动确定内层循环次数使单次测量不少于 min_time，再重复多次取最小值与中位数。
+
+import datetime
+import gc
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+
+SRC_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+
+class Case:
+    """一个基准用例：func 无参数调用一次算一次操作；nbytes 给出时额外报告 MB/s"""
+
+    def __init__(self, name, func, group, params=None, nbytes=None, setup=None):
+        self.name = name
+        self.func = func
+        self.group = group
+        self.params = params or {}
+        self.nbytes = nbytes
+        self.setup = setup
+
+
+def _time(func, number):
+    start = time.perf_counter()
+    for _ in range(number):
+        func()
+    return time.perf_counter() - start
+
+
+def measure(case, repeat=5, min_time=0.2) -> dict:
+    """测量单个用例，返回每次操作的耗时统计"""
+    if case.setup is not None:
+        case.setup()
+    case.func()  # 预热：建表、填充缓存、启动工作池等一次性开销不计入
+    number = 1
+    while True:
+        elapsed = _time(case.func, number)
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed == 0 else max(2, min(10, int(min_time / elapsed) + 1))
+
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        timings = [_time(case.func, number) / number for _ in range(repeat)]
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    best, median = min(timings), statistics.median(timings)
+    result = {
+        'group': case.group,
+        'params': case.params,
+        'number': number,
+        'repeat': repeat,
+        'seconds_min': best,
+        'seconds_median': median,
+        'ops_per_sec': 1.0 / median if median else 0.0,
+    }
+    if case.nbytes:
+        result['mb_per_sec'] = case.nbytes / median / (1 << 20) if median else 0.0
+    return result
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=SRC_DIR, capture_output=True,
+                             text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def machine_metadata() -> dict:
+    """运行环境信息，随结果一起保存，比较时据此提示环境差异"""
+    meta = {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'hostname': platform.node(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpu_count': os.cpu_count(),
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'git_commit': _git_commit(),
+    }
+    try:
+        import numpy
+        meta['numpy'] = numpy.__version__
+    except ImportError:
+        meta['numpy'] = None
+    return meta
+
+
+# 环境差异会影响可比性的字段
+COMPARABLE_FIELDS = ('machine', 'processor', 'cpu_count', 'python', 'implementation', 'numpy')
+
+
+def compare(baseline: dict, current: dict, threshold=0.10) -> dict:
+    """
+    按中位数耗时比较两份结果。
+    ratio = 当前 / 基线，ratio > 1 + threshold 判为退化，< 1 - threshold 判为提升。
+    返回: {'rows': [...], 'regressions': [...], 'missing': [...], 'environment': [...]}
+    """
+    rows, regressions = [], []
+    base_results, cur_results = baseline.get('results', {}), current.get('results', {})
+    for name, cur in cur_results.items():
+        base = base_results.get(name)
+        if base is None:
+            rows.append({'name': name, 'status': 'new', 'current': cur['seconds_median']})
+            continue
+        ratio = cur['seconds_median'] / base['seconds_median'] if base['seconds_median'] else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        row = {'name': name, 'status': status, 'baseline': base['seconds_median'],
+               'current': cur['seconds_median'], 'ratio': ratio}
+        rows.append(row)
+        if status == 'regression':
+            regressions.append(row)
+
+    groups = {cur.get('group') for cur in cur_results.values()}
+    base_meta, cur_meta = baseline.get('metadata', {}), current.get('metadata', {})
+    environment = [(field, base_meta.get(field), cur_meta.get(field))
+                   for field in COMPARABLE_FIELDS if base_meta.get(field) != cur_meta.get(field)]
+    return {
+        'rows': rows,
+        'regressions': regressions,
+        # 只报告本次运行过的分组中缺失的用例（按分组运行时不误报）
+        'missing': sorted(name for name, base in base_results.items()
+                          if name not in cur_results and base.get('group') in groups),
+        'environment': environment,
+    }
+
+
+def format_seconds(seconds) -> str:
+    for unit, scale in (('s', 1.0), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
@@ -0,0 +1,90 @@
+# run.py - 基准测试入口
+#   python benchmarks/run.py -o baseline.json                 运行全部基准并保存 JSON
+#   python benchmarks/run.py --compare baseline.json          运行并与基线比较，有退化时退出码为 1
+#   python benchmarks/run.py --compare baseline.json --current new.json   只比较两份已保存结果
+
+import argparse
+import json
+import sys
+
+import harness
+import bench_brute
+import bench_core
+import bench_http
+
+SUITES = {
+    'core': bench_core,
+    'brute': bench_brute,
+    'http': bench_http,
+}
+
+
+def run(groups, quick=False, repeat=5, min_time=0.2, name_filter=None) -> dict:
+    results = {}
+    for group in groups:
+        for case in SUITES[group].cases(quick=quick):
+            if name_filter and name_filter not in case.name:
+                continue
+            result = harness.measure(case, repeat=repeat, min_time=min_time)
+            results[case.name] = result
+            line = f"{case.name:<48} {harness.format_seconds(result['seconds_median']):>12}"
+            if 'mb_per_sec' in result:
+                line += f"  {result['mb_per_sec']:10.2f} MB/s"
+            print(line, file=sys.stderr)
+    return {'metadata': harness.machine_metadata(), 'results': results}
+
+
+def print_comparison(report, threshold):
+    for field, base, cur in report['environment']:
+        print(f"注意: 运行环境不同 {field}: {base} -> {cur}，结果仅供参考")
+    for row in report['rows']:
+        if row['status'] == 'new':
+            print(f"  NEW   {row['name']:<48} {harness.format_seconds(row['current']):>12}")
+            continue
+        flag = {'regression': 'SLOWER', 'improved': 'FASTER', 'ok': ''}[row['status']]
+        print(f"{flag:>7} {row['name']:<48} {harness.format_seconds(row['baseline']):>12} -> "
+              f"{harness.format_seconds(row['current']):>12}  x{row['ratio']:.2f}")
+    for name in report['missing']:
+        print(f"MISSING {name}")
+    n = len(report['regressions'])
+    print(f"\n{n} 项退化（阈值 {threshold:.0%}）" if n else f"\n无退化（阈值 {threshold:.0%}）")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="S-DES 基准测试")
+    parser.add_argument('-o', '--output', help="结果 JSON 输出文件（默认输出到 stdout）")
+    parser.add_argument('-g', '--groups', nargs='+', choices=list(SUITES), default=list(SUITES))
+    parser.add_argument('-k', '--filter', help="只运行名称包含该字符串的用例")
+    parser.add_argument('--quick', action='store_true', help="缩小规模，快速冒烟")
+    parser.add_argument('--repeat', type=int, default=5, help="重复测量次数（默认 5）")
+    parser.add_argument('--min-time', type=float, default=0.2, help="单次测量最短时间（秒，默认 0.2）")
+    parser.add_argument('--compare', metavar='BASELINE', help="与该基线结果比较")
+    parser.add_argument('--current', metavar='RESULTS', help="与 --compare 一起使用：不运行，直接比较该结果文件")
+    parser.add_argument('--threshold', type=float, default=0.10, help="判定退化的相对阈值（默认 0.10）")
+    args = parser.parse_args(argv)
+
+    if args.current:
+        if not args.compare:
+            parser.error("--current 需要与 --compare 一起使用")
+        with open(args.current, encoding='utf-8') as f:
+            current = json.load(f)
+    else:
+        current = run(args.groups, args.quick, args.repeat, args.min_time, args.filter)
+        text = json.dumps(current, ensure_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, 'w', encoding='utf-8') as f:
+                f.write(text + '\n')
+        elif not args.compare:
+            print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        report = harness.compare(baseline, current, args.threshold)
+        print_comparison(report, args.threshold)
+        return 1 if report['regressions'] else 0
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,131 @@
+# bitslice.py - 位切片（bitsliced）S-DES 暴力破解内核
+# 把多个候选密钥按位打包成“位平面”：第 i 个平面是一个整数，其第 j 位为第 j 个候选密钥的第 i 位。
+# S-DES 的置换/移位只是平面重新接线，S-Box 用异或/与门网络实现，一次运算即覆盖全部通道。
+# 平面用 Python 大整数表示，通道数不限于 64。
+
+import sdes
+
+
+def _wire(planes, permutation):
+    """置换 = 平面重新接线（位序号从 1 开始）"""
+    return [planes[i - 1] for i in permutation]
+
+
+def _rotl(planes, shifts):
+    return planes[shifts:] + planes[:shifts]
+
+
+def _mux(select, when_one, when_zero):
+    """逐通道选择：select 为 1 取 when_one，否则取 when_zero"""
+    return when_zero ^ ((when_one ^ when_zero) & select)
+
+
+def _s_box_gates(s_box):
+    """把 4 进 2 出的 S-Box 展开为关于输入位的多路选择网络（位序同 sdes.s_box_lookup）"""
+    # 真值表：下标为 4 位输入（b1 b2 b3 b4），值为 2 位输出
+    truth = [s_box[((v >> 2) & 2) | (v & 1)][(v >> 1) & 3] for v in range(16)]
+
+    def evaluate(b1, b2, b3, b4, ones):
+        outputs = []
+        for out_bit in (1, 0):
+            # 先按 b4 选择、再按 b3、b2、b1 逐级归并
+            level = [ones if (truth[v] >> out_bit) & 1 else 0 for v in range(16)]
+            for select in (b4, b3, b2, b1):
+                level = [_mux(select, level[i + 1], level[i]) for i in range(0, len(level), 2)]
+            outputs.append(level[0])
+        return outputs
+
+    return evaluate
+
+
+_S1_GATES = _s_box_gates(sdes.S1)
+_S2_GATES = _s_box_gates(sdes.S2)
+
+
+def pack_keys(keys):
+    """把密钥列表打包为 10 个位平面（第 0 个平面对应密钥最高位），返回 (planes, ones)"""
+    planes = [0] * 10
+    for lane, key in enumerate(keys):
+        for i in range(10):
+            if (key >> (9 - i)) & 1:
+                planes[i] |= 1 << lane
+    return planes, (1 << len(keys)) - 1
+
+
+_ALL_KEY_PLANES, _ = pack_keys(range(1024))
+
+
+def pack_range(start, end):
+    """连续密钥区间 [start, end) 的位平面，直接从全密钥空间平面中截取"""
+    ones = (1 << (end - start)) - 1
+    return [(plane >> start) & ones for plane in _ALL_KEY_PLANES], ones
+
+
+def constant_planes(value, width, ones):
+    """把所有通道共用的常量（如明文）展开为位平面"""
+    return [ones if (value >> (width - 1 - i)) & 1 else 0 for i in range(width)]
+
+
+def subkey_planes(key_planes):
+    """位切片子密钥生成：纯接线，无门运算"""
+    key_p10 = _wire(key_planes, sdes.P10)
+    left_half, right_half = key_p10[:5], key_p10[5:]
+    k1 = _wire(_rotl(left_half, 1) + _rotl(right_half, 1), sdes.P8)
+    k2 = _wire(_rotl(left_half, 2) + _rotl(right_half, 2), sdes.P8)
+    return k1, k2
+
+
+def _f_function(right, subkey, ones):
+    expanded = [a ^ b for a, b in zip(_wire(right, sdes.EP), subkey)]
+    s_out = _S1_GATES(*expanded[:4], ones) + _S2_GATES(*expanded[4:], ones)
+    return _wire(s_out, sdes.P4)
+
+
+def _crypt_planes(block_planes, first, second, ones):
+    state = _wire(block_planes, sdes.IP)
+    left, right = state[:4], state[4:]
+    # 第一轮 + 交换（SW）
+    left, right = right, [a ^ b for a, b in zip(left, _f_function(right, first, ones))]
+    # 第二轮（不交换）
+    left = [a ^ b for a, b in zip(left, _f_function(right, second, ones))]
+    return _wire(left + right, sdes.IP_INV)
+
+
+def encrypt_planes(block_planes, key_planes, ones):
+    """位切片加密：8 个分组平面 + 10 个密钥平面 -> 8 个密文平面"""
+    k1, k2 = subkey_planes(key_planes)
+    return _crypt_planes(block_planes, k1, k2, ones)
+
+
+def decrypt_planes(block_planes, key_planes, ones):
+    """位切片解密：子密钥顺序为 K2、K1"""
+    k1, k2 = subkey_planes(key_planes)
+    return _crypt_planes(block_planes, k2, k1, ones)
+
+
+def match_mask(pairs, key_planes, ones):
+    """所有 (明文, 密文) 整数对都成立的通道掩码；掩码为 0 时提前结束"""
+    k1, k2 = subkey_planes(key_planes)
+    mask = ones
+    for pt, ct in pairs:
+        out = _crypt_planes(constant_planes(pt, 8, ones), k1, k2, ones)
+        for plane, expected in zip(out, constant_planes(ct, 8, ones)):
+            mask &= ~(plane ^ expected)
+        mask &= ones
+        if not mask:
+            break
+    return mask
+
+
+def search(pairs, start=0, end=1024):
+    """在密钥区间 [start, end) 内位切片搜索，返回匹配的整数密钥（升序）"""
+    if start >= end:
+        return []
+    key_planes, ones = pack_range(start, end)
+    mask = match_mask(pairs, key_planes, ones)
+    keys = []
+    while mask:
+        low = mask & -mask
+        keys.append(start + low.bit_length() - 1)
+        mask ^= low
+    return keys
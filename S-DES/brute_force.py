@@ -1,9 +1,70 @@
 # brute_force.py - S-DES 暴力破解功能
 
 import sdes
+import codebook
+import bitslice
+import key_index
+import profiling
+import os
+import sys
 import time
 import threading
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, List, NamedTuple, Optional, Tuple
+
+BACKENDS = ("thread", "process", "inline")
+TOTAL_KEYS = 2 ** 10
+BATCH_SIZE = 64  # 需要进度/取消/超时/首个匹配即停时每批评估的密钥数，批次之间检查这些条件
+
+# 共享线程池/进程池的大小与同时在处理的破解请求上限（可由环境变量配置）
+POOL_WORKERS = max(1, int(os.environ.get('SDES_BRUTE_WORKERS', os.cpu_count() or 1)))
+MAX_PENDING = max(1, int(os.environ.get('SDES_BRUTE_QUEUE', 64)))
+
+# 线程池/进程池：进程级单例，首次使用时创建，之后所有调用复用
+_thread_pool = None
+_process_pool = None
+_pool_lock = threading.Lock()
+
+_pending = 0
+_pending_lock = threading.Lock()
+
+
+class BruteForceBusy(Exception):
+    """同时在处理的破解请求数已达上限"""
+
+
+def try_acquire() -> bool:
+    """尝试占用一个准入名额，已达 MAX_PENDING 时返回 False；成功后须调用 release()"""
+    global _pending
+    with _pending_lock:
+        if _pending >= MAX_PENDING:
+            return False
+        _pending += 1
+        return True
+
+
+def release():
+    """释放 try_acquire() 占用的准入名额"""
+    global _pending
+    with _pending_lock:
+        _pending -= 1
+
+
+@contextmanager
+def admit():
+    """准入控制：超过 MAX_PENDING 个并发请求时抛出 BruteForceBusy"""
+    if not try_acquire():
+        raise BruteForceBusy()
+    try:
+        yield
+    finally:
+        release()
+
+
+def queue_depth() -> int:
+    """当前已准入（排队中 + 处理中）的破解请求数"""
+    return _pending
 
 
 def brute_force(plaintext, ciphertext):
@@ -12,14 +73,14 @@ def brute_force(plaintext, ciphertext):
     遍历所有可能的 10 位密钥，找到匹配的密钥
     """
     matched_keys = []
+    table = codebook.encrypt_codebook()  # 首次调用时构建码本，不计入耗时
     start_time = time.time()
 
-    # 遍历所有 2^10 = 1024 个可能的密钥
+    # 遍历所有 2^10 = 1024 个可能的密钥（全码本查表）
+    pt, ct = int(plaintext, 2), int(ciphertext, 2)
     for i in range(2 ** 10):
-        key = f"{i:010b}"  # 转换为 10 位二进制字符串
-        encrypted = sdes.encrypt(plaintext, key)
-        if encrypted == ciphertext:
-            matched_keys.append(key)
+        if table[(i << 8) | pt] == ct:
+            matched_keys.append(f"{i:010b}")  # 转换为 10 位二进制字符串
 
     end_time = time.time()
     elapsed_time = end_time - start_time
@@ -28,58 +89,153 @@ def brute_force(plaintext, ciphertext):
 
 
 def _search_range(start_key: int, end_key: int, pairs: List[Tuple[str, str]], out_list: list):
-    """在线程中搜索指定范围内的密钥，所有明密文对均匹配才记录。"""
-    for i in range(start_key, end_key):
-        key = f"{i:010b}"
-        ok = True
-        for pt, ct in pairs:
-            if sdes.encrypt(pt, key) != ct:
-                ok = False
-                break
-        if ok:
-            out_list.append(key)
-
-
-def brute_force_multi(pairs: List[Tuple[str, str]], threads: int = 1):
+    """在线程中搜索指定范围内的密钥，所有明密文对均匹配才记录（位切片，一次评估整个区间）。"""
+    int_pairs = [(int(pt, 2), int(ct, 2)) for pt, ct in pairs]
+    for key in bitslice.search(int_pairs, start_key, end_key):
+        out_list.append(f"{key:010b}")
+
+
+def _search_chunk(start_key: int, end_key: int, pairs: List[Tuple[str, str]]) -> list:
+    """进程池任务：返回区间内匹配的密钥（需可被 pickle，故为模块级函数）"""
+    out = []
+    _search_range(start_key, end_key, pairs, out)
+    return out
+
+
+def get_thread_pool() -> ThreadPoolExecutor:
+    """获取共享线程池（大小为 POOL_WORKERS），不存在时创建"""
+    global _thread_pool
+    with _pool_lock:
+        if _thread_pool is None:
+            _thread_pool = ThreadPoolExecutor(max_workers=POOL_WORKERS, thread_name_prefix='brute-force')
+        return _thread_pool
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """获取共享进程池（大小为 POOL_WORKERS），不存在时创建"""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is None:
+            _process_pool = ProcessPoolExecutor(max_workers=POOL_WORKERS)
+        return _process_pool
+
+
+def shutdown_process_pool():
+    """关闭共享进程池（下次使用时会重新创建）"""
+    global _process_pool
+    with _pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown()
+            _process_pool = None
+
+
+class BruteForceResult(NamedTuple):
+    """brute_force_multi 的结果"""
+    keys: List[str]        # 匹配的密钥（升序）
+    tried: int             # 已评估的密钥数
+    elapsed: float         # 耗时（秒）
+    cancelled: bool = False  # 因取消或超时提前结束
+    timed_out: bool = False  # 因超时提前结束
+
+
+def brute_force_multi(pairs: List[Tuple[str, str]], threads: int = 1, backend: str = "thread",
+                      use_index: bool = True,
+                      progress: Optional[Callable[[int, int, List[str]], None]] = None,
+                      cancel_event: Optional[threading.Event] = None,
+                      timeout: Optional[float] = None,
+                      first_match_only: bool = False) -> BruteForceResult:
     """
-    多明密文对 + 可选多线程的暴力破解。
+    多明密文对 + 可选并行的暴力破解。
     - pairs: [(plaintext8, ciphertext8), ...]
-    - threads: 线程数，>=1
-    返回: (matched_keys, elapsed_time)
+    - threads: 并行度（分片数），>=1，且不超过共享池大小 POOL_WORKERS
+    - backend: "thread"（共享线程池，受 GIL 限制）、"process"（共享进程池，真正多核）或 "inline"（当前线程直接计算）
+    - use_index: 倒排索引已构建时直接查索引，不再遍历密钥
+    - progress: 每轮批次完成后在调用线程中回调 progress(tried, total, new_keys)
+    - cancel_event: 置位后在下一轮批次之前停止
+    - timeout: 超过该秒数后在下一轮批次之前停止
+    - first_match_only: 找到第一个匹配的密钥即停止，只返回该密钥
+    指定后四项中任意一项时按 BATCH_SIZE 分批（每轮 threads 批）；否则每个 worker 一次处理整个分片。
+    返回: BruteForceResult(keys, tried, elapsed, cancelled, timed_out)
     """
+    if backend not in BACKENDS:
+        raise ValueError(f"backend 必须是 {', '.join(BACKENDS)} 之一")
     if not pairs:
-        return [], 0.0
-
-    total_keys = 2 ** 10
-    threads = max(1, int(threads))
-    step = (total_keys + threads - 1) // threads
+        return BruteForceResult([], 0, 0.0)
 
-    matched_keys_shared = []
-    matched_keys_lock = threading.Lock()
+    if use_index and key_index.is_built():
+        start_time = time.time()
+        int_pairs = [(int(pt, 2), int(ct, 2)) for pt, ct in pairs]
+        matched_keys = [f"{k:010b}" for k in key_index.recover_keys(int_pairs)]
+        if first_match_only:
+            matched_keys = matched_keys[:1]
+        if progress is not None:
+            progress(TOTAL_KEYS, TOTAL_KEYS, matched_keys)
+        return BruteForceResult(matched_keys, TOTAL_KEYS, time.time() - start_time)
 
-    def worker(start, end):
-        local = []
-        _search_range(start, end, pairs, local)
-        if local:
-            with matched_keys_lock:
-                matched_keys_shared.extend(local)
+    # 并行度不超过共享池大小
+    threads = 1 if backend == "inline" else min(max(1, int(threads)), POOL_WORKERS)
+    controlled = progress is not None or cancel_event is not None or timeout is not None or first_match_only
+    batch = BATCH_SIZE if controlled else (TOTAL_KEYS + threads - 1) // threads
+    pool = None
+    if backend == "process":
+        pool = get_process_pool()
+    elif backend == "thread":
+        pool = get_thread_pool()
 
     start_time = time.time()
-    ts = []
-    for t in range(threads):
-        start = t * step
-        end = min((t + 1) * step, total_keys)
-        if start >= end:
-            continue
-        th = threading.Thread(target=worker, args=(start, end), daemon=True)
-        ts.append(th)
-        th.start()
+    deadline = start_time + timeout if timeout is not None else None
+    matched_keys = []
+    tried = 0
+    cancelled = timed_out = False
+    for round_start in range(0, TOTAL_KEYS, batch * threads):
+        if cancel_event is not None and cancel_event.is_set():
+            cancelled = True
+            break
+        if deadline is not None and time.time() >= deadline:
+            cancelled = timed_out = True
+            break
+        round_end = min(round_start + batch * threads, TOTAL_KEYS)
+        ranges = [(start, min(start + batch, round_end)) for start in range(round_start, round_end, batch)]
+        if pool is None:
+            new_keys = []
+            for start, end in ranges:
+                _search_range(start, end, pairs, new_keys)
+        else:
+            futures = [pool.submit(_search_chunk, start, end, pairs) for start, end in ranges]
+            new_keys = [k for future in futures for k in future.result()]
+        if first_match_only and new_keys:
+            new_keys = [min(new_keys)]
+        matched_keys.extend(new_keys)
+        tried = round_end
+        if progress is not None:
+            progress(tried, TOTAL_KEYS, new_keys)
+        if first_match_only and matched_keys:
+            break
+    return BruteForceResult(sorted(set(matched_keys)), tried, time.time() - start_time, cancelled, timed_out)
+
+
+def measure_speedup(pairs: List[Tuple[str, str]], worker_counts=(1, 2, 4), backend: str = "process", repeat: int = 5):
+    """
+    测量不同并行度下的实际墙钟加速比（相对于 1 个 worker）。
+    并行度按实际生效值（不超过 POOL_WORKERS）去重；inline 后端不支持并行，不做测量。
+    返回: [{'workers': 实际并行度, 'elapsed': 最佳耗时, 'speedup': 加速比}, ...]
+    """
+    if backend == "inline":
+        raise ValueError("inline 后端不支持并行，无法测量加速比")
+    effective = sorted({min(max(1, n), POOL_WORKERS) for n in worker_counts})
+    # 预热（创建进程池、加载模块），不计入测量
+    brute_force_multi(pairs, threads=effective[-1], backend=backend, use_index=False)
+    best = {}
+    for n in effective:
+        best[n] = min(brute_force_multi(pairs, threads=n, backend=backend, use_index=False).elapsed
+                      for _ in range(repeat))
+    baseline = best[effective[0]]
+    return [{'workers': n, 'elapsed': best[n], 'speedup': baseline / best[n] if best[n] else 0.0}
+            for n in effective]
 
-    for th in ts:
-        th.join()
 
-    elapsed_time = time.time() - start_time
-    return sorted(set(matched_keys_shared)), elapsed_time
+# 可选插桩（见 profiling.py）；进程池后端的分片在子进程中执行，不计入当前进程的统计
+profiling.register(sys.modules[__name__], ("brute_force", "brute_force_multi", "_search_range", "_search_chunk"))
 
 
 def test_brute_force():
@@ -115,12 +271,29 @@ def test_brute_force_multi():
     ct2 = sdes.encrypt(pt2, key)
     pairs = [(pt1, ct1), (pt2, ct2)]
     print("开始暴力破解(多对/多线程=4)...")
-    matched_keys, elapsed = brute_force_multi(pairs, threads=4)
-    print(f"完成，耗时: {elapsed:.4f} 秒; 匹配数量: {len(matched_keys)}")
-    for k in matched_keys:
+    result = brute_force_multi(pairs, threads=4)
+    print(f"完成，耗时: {result.elapsed:.4f} 秒; 匹配数量: {len(result.keys)}")
+    for k in result.keys:
         ok = all(sdes.encrypt(pt, k) == ct for pt, ct in pairs)
         print(f"- {k} 验证: {'成功' if ok else '失败'}")
 
+    result = brute_force_multi(pairs, first_match_only=True)
+    print(f"\n找到第一个即停止: {result.keys}，已尝试 {result.tried} 个密钥")
+
+    cancel = threading.Event()
+    cancel.set()
+    result = brute_force_multi(pairs, cancel_event=cancel)
+    print(f"预先取消: cancelled={result.cancelled}，已尝试 {result.tried} 个密钥")
+
+    key_index.build()
+    result = brute_force_multi(pairs)
+    print(f"\n倒排索引查询: 耗时 {result.elapsed:.6f} 秒; 匹配数量: {len(result.keys)}")
+
+    for backend in ("thread", "process"):
+        print(f"\n后端 {backend} 各并行度加速比（共享池大小 {POOL_WORKERS}）:")
+        for row in measure_speedup(pairs, backend=backend):
+            print(f"- {row['workers']} worker: {row['elapsed']:.4f} 秒, 加速比 {row['speedup']:.2f}x")
+
 
 if __name__ == "__main__":
     test_brute_force()
@@ -0,0 +1,188 @@
+# cli.py - S-DES 命令行工具（python -m sdes 或 python cli.py）
+#   enc / dec : 流式加解密，默认 stdin -> stdout，按大块缓冲读写
+#   crack     : 已知明密文对求密钥
+#   bench     : 各工作模式吞吐量测试
+
+import argparse
+import os
+import sys
+import time
+
+import brute_force
+import modes
+
+KEY_FORMATS = ("bin", "hex", "int")
+DEFAULT_BUFFER_SIZE = 1 << 20
+
+
+def parse_key(text, key_format="bin") -> int:
+    """按指定格式解析密钥，返回 0~1023 的整数"""
+    try:
+        if key_format == "bin":
+            if len(text) != 10:
+                raise ValueError
+            key = int(text, 2)
+        elif key_format == "hex":
+            key = int(text, 16)
+        else:
+            key = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无法按 {key_format} 格式解析密钥: {text!r}")
+    if not 0 <= key < 1024:
+        raise argparse.ArgumentTypeError("密钥必须在 0~1023 之间")
+    return key
+
+
+def parse_iv(text) -> int:
+    """IV 支持 0x/0b 前缀或十进制，取值 0~255"""
+    try:
+        iv = int(text, 0)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无法解析 IV: {text!r}")
+    if not 0 <= iv < 256:
+        raise argparse.ArgumentTypeError("IV 必须在 0~255 之间")
+    return iv
+
+
+def positive_int(text) -> int:
+    try:
+        value = int(text)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"无法解析整数: {text!r}")
+    if value <= 0:
+        raise argparse.ArgumentTypeError("必须是正整数")
+    return value
+
+
+def _same_file(input_path, output_path) -> bool:
+    """输入与输出是否为同一文件（以 "wb" 打开输出会在读取前清空输入）"""
+    if input_path in (None, "-") or output_path in (None, "-") or not os.path.exists(output_path):
+        return False
+    try:
+        return os.path.samefile(input_path, output_path)
+    except OSError:
+        return False
+
+
+def _open_input(path):
+    return sys.stdin.buffer if path in (None, "-") else open(path, "rb")
+
+
+def _open_output(path):
+    return sys.stdout.buffer if path in (None, "-") else open(path, "wb")
+
+
+def _stream(args, decrypt: bool) -> int:
+    key = parse_key(args.key, args.key_format)
+    ctx = (modes.decryptor if decrypt else modes.encryptor)(key, args.mode, args.iv)
+    fin, fout = _open_input(args.input), _open_output(args.output)
+    try:
+        while True:
+            chunk = fin.read(args.buffer_size)
+            if not chunk:
+                break
+            fout.write(ctx.update(chunk))
+        fout.write(ctx.finalize())
+        fout.flush()
+    finally:
+        if fin is not sys.stdin.buffer:
+            fin.close()
+        if fout is not sys.stdout.buffer:
+            fout.close()
+    return 0
+
+
+def _read_pairs(args):
+    pairs = [tuple(p) for p in args.pair or []]
+    if args.pairs_file:
+        with open(args.pairs_file, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if parts:
+                    if len(parts) != 2:
+                        raise ValueError(f"格式错误: '{line.strip()}' 应为: PT CT")
+                    pairs.append((parts[0], parts[1]))
+    for pt, ct in pairs:
+        if len(pt) != 8 or len(ct) != 8 or any(c not in "01" for c in pt + ct):
+            raise ValueError(f"位串错误: '{pt} {ct}'，PT/CT需为8位二进制")
+    return pairs
+
+
+def cmd_crack(args) -> int:
+    try:
+        pairs = _read_pairs(args)
+    except ValueError as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 2
+    if not pairs:
+        print("错误: 至少提供一个明密文对（--pair PT CT 或 --pairs-file）", file=sys.stderr)
+        return 2
+    result = brute_force.brute_force_multi(pairs, threads=args.threads, backend=args.backend,
+                                           timeout=args.timeout, first_match_only=args.first)
+    for k in result.keys:
+        print(k)
+    print(f"匹配 {len(result.keys)} 个密钥，已尝试 {result.tried} 个，耗时 {result.elapsed:.6f} 秒"
+          + ("（超时提前结束）" if result.timed_out else ""), file=sys.stderr)
+    return 0 if result.keys else 1
+
+
+def cmd_bench(args) -> int:
+    data = os.urandom(int(args.size * (1 << 20)))
+    key = 0b1100110011
+    for mode in args.modes:
+        best = float("inf")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            modes.encrypt(data, key, mode, 0x5A)
+            best = min(best, time.perf_counter() - start)
+        print(f"{mode:>4}: {len(data) / best / (1 << 20):10.2f} MB/s")
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m sdes", description="S-DES 命令行工具")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    for name, helptext in (("enc", "加密"), ("dec", "解密")):
+        p = sub.add_parser(name, help=f"流式{helptext}（默认 stdin -> stdout）")
+        p.add_argument("-k", "--key", required=True, help="密钥")
+        p.add_argument("--key-format", choices=KEY_FORMATS, default="bin", help="密钥格式（默认 bin）")
+        p.add_argument("-m", "--mode", choices=modes.MODES, default="ecb", help="工作模式（默认 ecb）")
+        p.add_argument("--iv", type=parse_iv, default=0, help="IV（0~255，可用 0x 前缀）")
+        p.add_argument("-i", "--input", help="输入文件（默认 stdin）")
+        p.add_argument("-o", "--output", help="输出文件（默认 stdout）")
+        p.add_argument("--buffer-size", type=positive_int, default=DEFAULT_BUFFER_SIZE, help="读写块大小（字节）")
+        p.set_defaults(func=lambda a, d=(name == "dec"): _stream(a, d))
+
+    p = sub.add_parser("crack", help="已知明密文对求密钥")
+    p.add_argument("-p", "--pair", nargs=2, action="append", metavar=("PT", "CT"), help="8 位二进制明密文对，可重复")
+    p.add_argument("--pairs-file", help="每行一个 'PT CT' 的文件")
+    p.add_argument("-t", "--threads", type=int, default=1, help="并行度")
+    p.add_argument("--backend", choices=brute_force.BACKENDS, default="inline", help="并行后端（默认 inline）")
+    p.add_argument("--timeout", type=float, help="耗时上限（秒），超时后返回已找到的密钥")
+    p.add_argument("--first", action="store_true", help="找到第一个匹配的密钥即停止")
+    p.set_defaults(func=cmd_crack)
+
+    p = sub.add_parser("bench", help="各工作模式加密吞吐量")
+    p.add_argument("--size", type=float, default=4, help="测试数据大小（MiB，默认 4）")
+    p.add_argument("--repeat", type=int, default=3, help="重复次数（取最佳）")
+    p.add_argument("--modes", nargs="+", choices=modes.MODES, default=list(modes.MODES))
+    p.set_defaults(func=cmd_bench)
+    return parser
+
+
+def main(argv=None) -> int:
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.command in ("enc", "dec"):
+        try:
+            parse_key(args.key, args.key_format)
+        except argparse.ArgumentTypeError as e:
+            parser.error(str(e))
+        if _same_file(args.input, args.output):
+            parser.error("输出文件不能与输入文件相同")
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
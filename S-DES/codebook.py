@@ -0,0 +1,156 @@
+# codebook.py - S-DES 全码本查表
+# 密钥空间 2^10 × 分组空间 2^8，完整加密码本与逆码本各 256 KiB，首次使用时构建。
+# 码本会持久化为带版本头的二进制文件，后续进程以只读 mmap 映射，多个 worker 共享同一份页面。
+
+import hashlib
+import mmap
+import os
+import struct
+import threading
+import sdes
+
+KEY_COUNT = 1024
+BLOCK_COUNT = 256
+TABLE_SIZE = KEY_COUNT * BLOCK_COUNT
+
+# 文件格式：魔数(6) + 版本(u16) + 算法表校验和(sha256, 32) + 码本内容校验和(sha256, 32) + 加密码本 + 解密码本
+FILE_MAGIC = b'SDESCB'
+FILE_VERSION = 2
+_HEADER = struct.Struct('<6sH32s32s')
+
+_encrypt_codebook = None
+_decrypt_codebook = None
+_build_lock = threading.Lock()
+
+
+def _cache_dir():
+    """当前用户的缓存目录（不使用全局可写的临时目录）"""
+    if os.name == 'nt':
+        base = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    else:
+        base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'sdes')
+
+
+def default_path():
+    """码本文件路径：环境变量 SDES_CODEBOOK_PATH 优先，设为空字符串则不落盘"""
+    path = os.environ.get('SDES_CODEBOOK_PATH')
+    if path is None:
+        path = os.path.join(_cache_dir(), f'sdes_codebook_v{FILE_VERSION}.bin')
+    return path
+
+
+def tables_checksum() -> bytes:
+    """置换表与 S-Box 的校验和，算法参数变化时旧文件即失效"""
+    spec = repr((sdes.P10, sdes.P8, sdes.IP, sdes.IP_INV, sdes.EP, sdes.P4, sdes.S1, sdes.S2))
+    return hashlib.sha256(spec.encode('ascii')).digest()
+
+
+def _content_checksum(encrypt_table, decrypt_table) -> bytes:
+    """两张码本内容的 SHA-256"""
+    digest = hashlib.sha256(encrypt_table)
+    digest.update(decrypt_table)
+    return digest.digest()
+
+
+def _compute():
+    """在内存中计算全码本：下标为 (key << 8) | block"""
+    ciphers = [sdes.SDESCipher(k) for k in range(KEY_COUNT)]
+    encrypt_table = b''.join(c.encrypt_table for c in ciphers)
+    decrypt_table = b''.join(c.decrypt_table for c in ciphers)
+    return encrypt_table, decrypt_table
+
+
+def write_file(path, encrypt_table, decrypt_table):
+    """写入码本文件（仅当前用户可读写；先写临时文件再原子替换，避免其他进程读到半成品）"""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, 'O_BINARY', 0), 0o600)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(_HEADER.pack(FILE_MAGIC, FILE_VERSION, tables_checksum(),
+                                 _content_checksum(encrypt_table, decrypt_table)))
+            f.write(encrypt_table)
+            f.write(decrypt_table)
+        os.replace(tmp_path, path)
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def open_file(path):
+    """只读 mmap 映射码本文件；文件缺失、属主不是当前用户、格式或任一校验和不符时返回 None"""
+    try:
+        with open(path, 'rb') as f:
+            st = os.fstat(f.fileno())
+            if st.st_size != _HEADER.size + 2 * TABLE_SIZE:
+                return None
+            if hasattr(os, 'getuid') and st.st_uid != os.getuid():
+                return None
+            magic, version, spec_checksum, content_checksum = _HEADER.unpack(f.read(_HEADER.size))
+            if (magic, version, spec_checksum) != (FILE_MAGIC, FILE_VERSION, tables_checksum()):
+                return None
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, struct.error):
+        return None
+    view = memoryview(mapped)
+    start = _HEADER.size
+    encrypt_table, decrypt_table = view[start:start + TABLE_SIZE], view[start + TABLE_SIZE:]
+    if _content_checksum(encrypt_table, decrypt_table) != content_checksum:
+        return None
+    return encrypt_table, decrypt_table
+
+
+def _load(path):
+    """优先映射已有文件，缺失、过期或损坏时重新生成；无法写盘时退回内存码本"""
+    if path:
+        tables = open_file(path)
+        if tables is not None:
+            return tables
+    tables = _compute()
+    if path:
+        try:
+            write_file(path, *tables)
+        except OSError:
+            return tables
+        return open_file(path) or tables
+    return tables
+
+
+def _build():
+    """构建（或映射）全码本"""
+    global _encrypt_codebook, _decrypt_codebook
+    with _build_lock:
+        if _encrypt_codebook is not None:
+            return
+        # 先写逆码本，加密码本作为“已构建”标志最后赋值
+        encrypt_table, _decrypt_codebook = _load(default_path())
+        _encrypt_codebook = encrypt_table
+
+
+def encrypt_codebook():
+    """完整加密码本（1024 × 256 字节，bytes 或只读 memoryview）"""
+    if _encrypt_codebook is None:
+        _build()
+    return _encrypt_codebook
+
+
+def decrypt_codebook():
+    """完整解密码本（1024 × 256 字节，bytes 或只读 memoryview）"""
+    if _decrypt_codebook is None:
+        _build()
+    return _decrypt_codebook
+
+
+def lookup(key: int, block: int) -> int:
+    """查表加密单个分组"""
+    return encrypt_codebook()[(key << 8) | block]
+
+
+def lookup_inverse(key: int, block: int) -> int:
+    """查表解密单个分组"""
+    return decrypt_codebook()[(key << 8) | block]
+
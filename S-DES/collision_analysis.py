@@ -1,7 +1,7 @@
 # collision_analysis.py - S-DES 碰撞分析
 # 分析密钥碰撞和密文碰撞情况
 
-import sdes
+import vectorized
 import itertools
 from collections import defaultdict
 import time
@@ -28,12 +28,9 @@ def analyze_key_collisions():
         print(f"测试明密文对: {plaintext} -> {ciphertext}")
         
         # 暴力破解找到所有匹配的密钥
-        matched_keys = []
-        for i in range(2 ** 10):  # 遍历所有1024个密钥
-            key = f"{i:010b}"
-            encrypted = sdes.encrypt(plaintext, key)
-            if encrypted == ciphertext:
-                matched_keys.append(key)
+        # 一次性计算全部1024个密钥下的结果
+        pair = (int(plaintext, 2), int(ciphertext, 2))
+        matched_keys = [f"{k:010b}" for k in vectorized.keys_matching([pair])]
         
         print(f"  找到匹配密钥数量: {len(matched_keys)}")
         
@@ -76,11 +73,9 @@ def analyze_ciphertext_collisions():
         # 记录每个密文对应的密钥
         ciphertext_to_keys = defaultdict(list)
         
-        # 遍历所有密钥
-        for i in range(2 ** 10):
-            key = f"{i:010b}"
-            ciphertext = sdes.encrypt(plaintext, key)
-            ciphertext_to_keys[ciphertext].append(key)
+        # 遍历所有密钥（批量计算全部密文）
+        for i, c in enumerate(vectorized.encrypt_all_keys(int(plaintext, 2))):
+            ciphertext_to_keys[f"{c:08b}"].append(f"{i:010b}")
         
         # 检查是否有密文碰撞
         collisions = {ct: keys for ct, keys in ciphertext_to_keys.items() if len(keys) > 1}
@@ -111,11 +106,10 @@ def analyze_key_space_distribution():
     key_to_ciphertext = {}
     
     # 统计所有密钥的密文
-    for i in range(2 ** 10):
-        key = f"{i:010b}"
-        ciphertext = sdes.encrypt(plaintext, key)
+    for i, c in enumerate(vectorized.encrypt_all_keys(int(plaintext, 2))):
+        ciphertext = f"{c:08b}"
         ciphertext_count[ciphertext] += 1
-        key_to_ciphertext[key] = ciphertext
+        key_to_ciphertext[f"{i:010b}"] = ciphertext
     
     print(f"明文: {plaintext}")
     print(f"密钥空间大小: 1024")
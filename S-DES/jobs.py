@@ -0,0 +1,151 @@
+# jobs.py - 后台暴力破解任务
+# 任务提交到有界线程池，超过排队上限时拒绝；任务与同步破解请求共用 brute_force 的准入控制（MAX_PENDING）
+# 和共享线程池，按批次搜索密钥并记录进度，可随时取消。
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+import brute_force
+import metrics
+
+TOTAL_KEYS = brute_force.TOTAL_KEYS
+
+
+class JobQueueFull(Exception):
+    """排队任务数已达上限"""
+
+
+class BruteForceJob:
+    """单个暴力破解任务的状态"""
+
+    def __init__(self, job_id: str, pairs: List[Tuple[str, str]], admitted: bool = False):
+        self.id = job_id
+        self.pairs = pairs
+        self._admitted = admitted  # 是否持有 brute_force 的准入名额，任务结束时释放
+        self.status = 'queued'  # queued / running / done / cancelled / error
+        self.error = None
+        self.tried = 0
+        self.matches = []
+        self.created = time.time()
+        self.started = None
+        self.finished = None
+        self.cancel_event = threading.Event()
+
+    def run(self):
+        """在工作线程中执行：逐批搜索，批次之间检查取消"""
+        try:
+            self._run()
+        finally:
+            self.release_admission()
+
+    def release_admission(self):
+        if self._admitted:
+            self._admitted = False
+            brute_force.release()
+
+    def _run(self):
+        if self.cancel_event.is_set():
+            self.status = 'cancelled'
+            self.finished = time.time()
+            return
+        self.status = 'running'
+        self.started = time.time()
+        try:
+            # 分批交给共享线程池计算，批次之间更新进度并检查取消
+            result = brute_force.brute_force_multi(self.pairs, threads=1, backend='thread', use_index=False,
+                                                   progress=self._on_progress, cancel_event=self.cancel_event)
+            self.status = 'cancelled' if result.cancelled else 'done'
+        except Exception as e:
+            self.status = 'error'
+            self.error = str(e)
+        finally:
+            self.finished = time.time()
+            metrics.record_brute_force(self.tried, self.finished - self.started)
+
+    def _on_progress(self, tried, total, new_keys):
+        self.matches.extend(new_keys)
+        self.tried = tried
+
+    def to_dict(self) -> dict:
+        """任务进度快照（供 API 返回）"""
+        if self.started is None:
+            elapsed = 0.0
+        else:
+            elapsed = (self.finished or time.time()) - self.started
+        return {
+            'id': self.id,
+            'status': self.status,
+            'error': self.error,
+            'total': TOTAL_KEYS,
+            'tried': self.tried,
+            'matches': list(self.matches),
+            'count': len(self.matches),
+            'elapsed': elapsed,
+            'keys_per_sec': self.tried / elapsed if elapsed > 0 else 0.0,
+        }
+
+
+class JobManager:
+    """任务管理：有界线程池 + 排队上限（含全局准入）+ 已完成任务的有限保留"""
+
+    def __init__(self, workers: int = 2, max_pending: int = 32, max_finished: int = 256):
+        self.workers = max(1, int(workers))
+        self.max_pending = max(1, int(max_pending))
+        self.max_finished = max(1, int(max_finished))
+        self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='brute-job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _pending(self) -> int:
+        return sum(1 for job in self._jobs.values() if job.status in ('queued', 'running'))
+
+    def _prune(self):
+        """只保留最近 max_finished 个已结束任务"""
+        finished = [job_id for job_id, job in self._jobs.items()
+                    if job.status not in ('queued', 'running')]
+        for job_id in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    def submit(self, pairs: List[Tuple[str, str]]) -> BruteForceJob:
+        """提交任务；排队数已满或破解请求总数已达 brute_force.MAX_PENDING 时抛出 JobQueueFull"""
+        with self._lock:
+            if self._pending() >= self.max_pending:
+                raise JobQueueFull()
+            # 从排队起即占用准入名额，与同步破解请求共同受限
+            if not brute_force.try_acquire():
+                raise JobQueueFull()
+            self._prune()
+            job = BruteForceJob(uuid.uuid4().hex, pairs, admitted=True)
+            self._jobs[job.id] = job
+        try:
+            self._executor.submit(job.run)
+        except Exception:
+            # 未能提交（如线程池已关闭）：释放名额并移除任务
+            job.release_admission()
+            with self._lock:
+                self._jobs.pop(job.id, None)
+            raise
+        return job
+
+    def get(self, job_id: str):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str):
+        """请求取消任务，返回任务（不存在时返回 None）"""
+        job = self.get(job_id)
+        if job is not None:
+            job.cancel_event.set()
+            if job.status == 'queued':
+                job.status = 'cancelled'
+                job.finished = time.time()
+        return job
+
+    def queue_depth(self) -> int:
+        """排队中 + 运行中的任务数"""
+        with self._lock:
+            return self._pending()
@@ -0,0 +1,81 @@
+# key_index.py - (明文, 密文) -> 密钥 倒排索引
+# 对每个明文字节，把 1024 个密钥按其密文排序存入 array('H')，并记录每个密文的起止偏移。
+# 单个明密文对的密钥恢复只需一次切片，多对时按位图求交集。
+
+import threading
+from array import array
+import codebook
+
+_keys_by_cipher = None   # 256 个 array('H')，每个含 1024 个按密文排序的密钥
+_offsets = None          # 256 个 array('H')，每个含 257 个偏移
+_build_lock = threading.Lock()
+
+
+def build():
+    """构建索引（已构建时直接返回）"""
+    global _keys_by_cipher, _offsets
+    with _build_lock:
+        if _keys_by_cipher is not None:
+            return
+        table = codebook.encrypt_codebook()
+        keys_by_cipher, offsets = [], []
+        for pt in range(256):
+            column = table[pt::256]  # 下标为密钥
+            keys = sorted(range(1024), key=column.__getitem__)
+            counts = [0] * 257
+            for ct in column:
+                counts[ct + 1] += 1
+            for ct in range(256):
+                counts[ct + 1] += counts[ct]
+            keys_by_cipher.append(array('H', keys))
+            offsets.append(array('H', counts))
+        # 偏移表作为“已构建”标志最后赋值
+        _keys_by_cipher = keys_by_cipher
+        _offsets = offsets
+
+
+def is_built() -> bool:
+    """索引是否已可用"""
+    return _offsets is not None
+
+
+def warm_up(background: bool = True):
+    """预先构建索引；background 为 True 时在守护线程中构建"""
+    if background:
+        threading.Thread(target=build, daemon=True).start()
+    else:
+        build()
+
+
+def keys_for_pair(pt: int, ct: int) -> array:
+    """单个明密文对对应的全部密钥（升序 array('H')）"""
+    if _offsets is None:
+        build()
+    offsets = _offsets[pt]
+    return _keys_by_cipher[pt][offsets[ct]:offsets[ct + 1]]
+
+
+def bitmap_for_pair(pt: int, ct: int) -> int:
+    """单个明密文对对应的密钥位图（1024 位整数，第 k 位表示密钥 k）"""
+    bitmap = 0
+    for key in keys_for_pair(pt, ct):
+        bitmap |= 1 << key
+    return bitmap
+
+
+def recover_keys(pairs) -> list:
+    """所有 (明文, 密文) 整数对都成立的密钥（升序）；多对时位图求交集"""
+    pairs = list(pairs)
+    if not pairs:
+        return []
+    bitmap = bitmap_for_pair(*pairs[0])
+    for pt, ct in pairs[1:]:
+        if not bitmap:
+            break
+        bitmap &= bitmap_for_pair(pt, ct)
+    keys = []
+    while bitmap:
+        low = bitmap & -bitmap
+        keys.append(low.bit_length() - 1)
+        bitmap ^= low
+    return keys
@@ -0,0 +1,163 @@
+# metrics.py - 进程内轻量指标（计数器 / 仪表 / 直方图），以 Prometheus 文本格式导出
+# 每次记录只有一次加锁和字典更新；多 worker 部署时每个进程各自导出自己的指标。
+
+import bisect
+import threading
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+_registry = []
+
+
+def _format_labels(labelnames, values, extra=()):
+    pairs = list(zip(labelnames, values)) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(v).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, v in pairs)
+    return '{' + ','.join(f'{k}="{v}"' for (k, _), v in zip(pairs, escaped)) + '}'
+
+
+def _format_value(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+        _registry.append(self)
+
+    def _key(self, labels):
+        return tuple(str(labels.get(name, '')) for name in self.labelnames)
+
+    def render(self):
+        lines = [f'# HELP {self.name} {self.documentation}', f'# TYPE {self.name} {self.kind}']
+        lines.extend(self._render_samples())
+        return lines
+
+
+class Counter(_Metric):
+    """单调递增计数器"""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def set_total(self, total, **labels):
+        """同步由其他组件累计的总数（该总数本身须单调递增）"""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = total
+
+    def value(self, **labels):
+        return self._values.get(self._key(labels), 0)
+
+    def _render_samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}' for k, v in items]
+
+
+class Gauge(_Metric):
+    """仪表：记录当前值"""
+    kind = 'gauge'
+
+    def set(self, value, **labels):
+        with self._lock:
+            self._values[self._key(labels)] = value
+
+    def _render_samples(self):
+        with self._lock:
+            items = list(self._values.items())
+        return [f'{self.name}{_format_labels(self.labelnames, k)} {_format_value(v)}' for k, v in items]
+
+
+class Histogram(_Metric):
+    """直方图：按桶累计观测值"""
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_samples(self):
+        with self._lock:
+            items = [(k, (list(counts), total, count)) for k, (counts, total, count) in self._values.items()]
+        lines = []
+        for key, (counts, total, count) in items:
+            cumulative = 0
+            for bound, n in zip(self.buckets + (float('inf'),), counts):
+                cumulative += n
+                labels = _format_labels(self.labelnames, key, [('le', _format_value(bound))])
+                lines.append(f'{self.name}_bucket{labels} {cumulative}')
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f'{self.name}_sum{labels} {_format_value(total)}')
+            lines.append(f'{self.name}_count{labels} {count}')
+        return lines
+
+
+def render() -> str:
+    """导出全部已注册指标（Prometheus 文本格式）"""
+    lines = []
+    for metric in _registry:
+        lines.extend(metric.render())
+    return '\n'.join(lines) + '\n'
+
+
+# ---------------- 服务通用指标 ----------------
+
+REQUESTS = Counter('sdes_http_requests_total', 'HTTP 请求数', ('route', 'method', 'status'))
+LATENCY = Histogram('sdes_http_request_duration_seconds', 'HTTP 请求耗时（秒）', ('route',))
+BYTES_PROCESSED = Counter('sdes_bytes_processed_total', '加解密处理的数据字节数', ('op',))
+BRUTE_KEYS = Counter('sdes_brute_force_keys_tried_total', '暴力破解已尝试的密钥数')
+BRUTE_SECONDS = Counter('sdes_brute_force_seconds_total', '暴力破解累计耗时（秒）')
+BRUTE_KEYS_PER_SEC = Gauge('sdes_brute_force_keys_per_second', '最近一次暴力破解的速度（keys/s）')
+
+
+def record_brute_force(keys_tried, elapsed):
+    """记录一次暴力破解的密钥数与耗时"""
+    BRUTE_KEYS.inc(keys_tried)
+    BRUTE_SECONDS.inc(elapsed)
+    if elapsed > 0:
+        BRUTE_KEYS_PER_SEC.set(keys_tried / elapsed)
+
+
+CACHE_HITS = Counter('sdes_cache_hits_total', '结果缓存命中次数')
+CACHE_MISSES = Counter('sdes_cache_misses_total', '结果缓存未命中次数')
+CACHE_HIT_RATIO = Gauge('sdes_cache_hit_ratio', '结果缓存命中率')
+CACHE_BYTES = Gauge('sdes_cache_bytes', '结果缓存内存占用（字节估算）')
+QUEUE_DEPTH = Gauge('sdes_worker_queue_depth', '工作池排队中 + 处理中的任务数', ('pool',))
+
+
+def update_service_gauges(cache=None, queues=None):
+    """导出前刷新由其他组件持有的状态（缓存统计、各工作池队列深度）"""
+    if cache is not None:
+        stats = cache.stats()
+        CACHE_HITS.set_total(stats['hits'])
+        CACHE_MISSES.set_total(stats['misses'])
+        CACHE_HIT_RATIO.set(stats['hit_ratio'])
+        CACHE_BYTES.set(stats['bytes'])
+    for pool, depth in (queues or {}).items():
+        QUEUE_DEPTH.set(depth, pool=pool)
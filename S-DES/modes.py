@@ -0,0 +1,148 @@
+# modes.py - S-DES 分组工作模式（ECB / CBC / CFB / OFB / CTR）
+# S-DES 分组长度为 8 位，即每个字节一个分组，因此各模式均无需填充，CFB-8 即整分组 CFB。
+# Encryptor / Decryptor 支持 update(chunk) 分块处理，内存占用与数据总量无关。
+# CTR 计数器为 8 位（iv + 分组序号 mod 256），OFB 密钥流是 iv 在置换 E_k 下的轨道，二者都以 256 为周期，
+# 可整段批量生成，并可从任意偏移开始计算（便于预计算或并行）。
+
+import sdes
+
+MODES = ("ecb", "cbc", "cfb", "ofb", "ctr")
+
+
+def normalize_iv(iv) -> int:
+    """IV 可为 0~255 的整数或 1 字节的 bytes"""
+    if isinstance(iv, (bytes, bytearray, memoryview)):
+        if len(iv) != 1:
+            raise ValueError("IV 必须为 1 字节")
+        return iv[0]
+    if not 0 <= iv < 256:
+        raise ValueError("IV 必须在 0~255 之间")
+    return iv
+
+
+def xor_bytes(data: bytes, stream: bytes) -> bytes:
+    """等长字节串按位异或（借助大整数一次完成）"""
+    n = len(data)
+    return (int.from_bytes(data, 'big') ^ int.from_bytes(stream, 'big')).to_bytes(n, 'big')
+
+
+def _tile(cycle: bytes, offset: int, length: int) -> bytes:
+    """从周期序列的 offset 处开始截取 length 字节"""
+    start = offset % len(cycle)
+    repeats = (start + length + len(cycle) - 1) // len(cycle)
+    return (cycle * repeats)[start:start + length]
+
+
+def ctr_keystream(key, iv, offset: int, length: int) -> bytes:
+    """CTR 密钥流：第 i 个字节为 E_k((iv + i) mod 256)，从分组 offset 开始取 length 字节"""
+    table = sdes.get_cipher(key).encrypt_table
+    iv = normalize_iv(iv)
+    cycle = bytes(table[(iv + i) & 0xFF] for i in range(256))
+    return _tile(cycle, offset, length)
+
+
+def ofb_keystream(key, iv, offset: int, length: int) -> bytes:
+    """OFB 密钥流：s_1 = E_k(iv)，s_i = E_k(s_(i-1))，从分组 offset 开始取 length 字节"""
+    table = sdes.get_cipher(key).encrypt_table
+    iv = normalize_iv(iv)
+    cycle = bytearray()
+    state = table[iv]
+    cycle.append(state)
+    while state != iv:
+        state = table[state]
+        cycle.append(state)
+    return _tile(bytes(cycle), offset, length)
+
+
+class _StreamContext:
+    """Encryptor / Decryptor 的公共部分"""
+
+    def __init__(self, key, mode="cbc", iv=0):
+        if mode not in MODES:
+            raise ValueError(f"mode 必须是 {', '.join(MODES)} 之一")
+        self.mode = mode
+        self.cipher = sdes.get_cipher(key)
+        self.iv = normalize_iv(iv)
+        self._prev = self.iv      # CBC / CFB：上一个密文分组
+        self._position = 0        # OFB / CTR：已处理的分组数
+        self._finalized = False
+
+    def _keystream(self, length: int) -> bytes:
+        make = ctr_keystream if self.mode == "ctr" else ofb_keystream
+        stream = make(self.cipher.key, self.iv, self._position, length)
+        self._position += length
+        return stream
+
+    def update(self, chunk) -> bytes:
+        """处理一段数据，返回对应的输出"""
+        if self._finalized:
+            raise ValueError("已调用 finalize()，不能继续 update()")
+        data = bytes(chunk)
+        if not data:
+            return b''
+        return self._process(data)
+
+    def finalize(self) -> bytes:
+        """结束处理（分组为 1 字节，无需填充，因此总是返回 b''）"""
+        self._finalized = True
+        return b''
+
+
+class Encryptor(_StreamContext):
+    """流式加密器：encryptor.update(chunk) ... encryptor.finalize()"""
+
+    def _process(self, data: bytes) -> bytes:
+        table = self.cipher.encrypt_table
+        if self.mode == "ecb":
+            return data.translate(table)
+        if self.mode in ("ofb", "ctr"):
+            return xor_bytes(data, self._keystream(len(data)))
+        # CBC / CFB 加密有链式依赖，只能逐字节
+        out = bytearray(len(data))
+        prev = self._prev
+        if self.mode == "cbc":
+            for i, b in enumerate(data):
+                prev = table[b ^ prev]
+                out[i] = prev
+        else:
+            for i, b in enumerate(data):
+                prev = b ^ table[prev]
+                out[i] = prev
+        self._prev = prev
+        return bytes(out)
+
+
+class Decryptor(_StreamContext):
+    """流式解密器：decryptor.update(chunk) ... decryptor.finalize()"""
+
+    def _process(self, data: bytes) -> bytes:
+        if self.mode == "ecb":
+            return data.translate(self.cipher.decrypt_table)
+        if self.mode in ("ofb", "ctr"):
+            return xor_bytes(data, self._keystream(len(data)))
+        # CBC / CFB 解密只依赖前一个密文分组，可整段批量完成
+        shifted = bytes([self._prev]) + data[:-1]
+        self._prev = data[-1]
+        if self.mode == "cbc":
+            return xor_bytes(data.translate(self.cipher.decrypt_table), shifted)
+        return xor_bytes(data, shifted.translate(self.cipher.encrypt_table))
+
+
+def encryptor(key, mode="cbc", iv=0) -> Encryptor:
+    return Encryptor(key, mode, iv)
+
+
+def decryptor(key, mode="cbc", iv=0) -> Decryptor:
+    return Decryptor(key, mode, iv)
+
+
+def encrypt(data, key, mode="cbc", iv=0) -> bytes:
+    """一次性加密"""
+    ctx = Encryptor(key, mode, iv)
+    return ctx.update(data) + ctx.finalize()
+
+
+def decrypt(data, key, mode="cbc", iv=0) -> bytes:
+    """一次性解密"""
+    ctx = Decryptor(key, mode, iv)
+    return ctx.update(data) + ctx.finalize()
@@ -0,0 +1,166 @@
+# profiling.py - 可选的热点函数插桩：调用次数、累计耗时（含 / 不含子调用）、折叠调用栈
+# 关闭时不做任何包装，模块里的函数就是原函数本身，因此没有额外开销；
+# 开启时把已登记的模块级函数替换为计时包装（模块内部经全局名调用的也会被统计），关闭时还原。
+# 开启方式：
+#   - 环境变量 SDES_PROFILE=1：进程内全程开启，退出时把报告写到 SDES_PROFILE_OUTPUT
+#     （.json 为 JSON，其余为折叠栈文本；路径中的 {pid} 替换为进程号），未设置时打印到 stderr；
+#   - with profiling.profile(): ...   只统计代码块内的调用。
+# 折叠栈格式（每行 "a;b;c 微秒数"）可直接交给 flamegraph.pl / speedscope 生成火焰图。
+
+import atexit
+import functools
+import json
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+_targets = []      # [(module, name)]，登记顺序
+_originals = {}    # (module, name) -> 原函数；非空表示已包装
+_enabled = False
+_stats_lock = threading.Lock()
+_functions = {}    # label -> [调用次数, 总耗时, 自身耗时]
+_stacks = {}       # "a;b;c" -> 自身耗时
+_local = threading.local()
+
+
+def _instrumented(label, func):
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        # frame: [调用栈路径, 子调用耗时]
+        frame = [stack[-1][0] + ';' + label if stack else label, 0.0]
+        stack.append(frame)
+        start = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - start
+            stack.pop()
+            if stack:
+                stack[-1][1] += elapsed
+            own = elapsed - frame[1]
+            with _stats_lock:
+                entry = _functions.get(label)
+                if entry is None:
+                    entry = _functions[label] = [0, 0.0, 0.0]
+                entry[0] += 1
+                entry[1] += elapsed
+                entry[2] += own
+                _stacks[frame[0]] = _stacks.get(frame[0], 0.0) + own
+    return wrapper
+
+
+def _wrap(module, name):
+    if (module, name) in _originals:
+        return
+    func = getattr(module, name)
+    _originals[(module, name)] = func
+    label = f"{module.__name__}.{name}"
+    setattr(module, name, _instrumented(label, func))
+
+
+def register(module, names):
+    """登记模块中需要插桩的函数；已开启时立即包装"""
+    for name in names:
+        _targets.append((module, name))
+        if _enabled:
+            _wrap(module, name)
+
+
+def is_enabled() -> bool:
+    return _enabled
+
+
+def enable():
+    """开启插桩（包装全部已登记函数）"""
+    global _enabled
+    _enabled = True
+    for module, name in _targets:
+        _wrap(module, name)
+
+
+def disable():
+    """关闭插桩（还原原函数），已收集的统计保留"""
+    global _enabled
+    _enabled = False
+    for (module, name), func in list(_originals.items()):
+        setattr(module, name, func)
+    _originals.clear()
+
+
+def reset():
+    """清空统计"""
+    with _stats_lock:
+        _functions.clear()
+        _stacks.clear()
+
+
+@contextmanager
+def profile(reset_stats=True):
+    """在 with 块内开启插桩；退出时若之前未开启则还原"""
+    was_enabled = _enabled
+    if reset_stats:
+        reset()
+    enable()
+    try:
+        yield
+    finally:
+        if not was_enabled:
+            disable()
+
+
+def stats() -> dict:
+    """按函数汇总：{label: {'calls', 'total', 'own'}}，耗时单位为秒"""
+    with _stats_lock:
+        return {label: {'calls': calls, 'total': total, 'own': own}
+                for label, (calls, total, own) in _functions.items()}
+
+
+def collapsed_stacks() -> str:
+    """折叠栈文本，每行 "调用栈 自身耗时（微秒）"，用于生成火焰图"""
+    with _stats_lock:
+        items = sorted(_stacks.items())
+    return ''.join(f"{path} {max(1, round(own * 1e6))}\n" for path, own in items)
+
+
+def report() -> str:
+    """按总耗时排序的文本报告"""
+    rows = sorted(stats().items(), key=lambda item: item[1]['total'], reverse=True)
+    own_sum = sum(row['own'] for _, row in rows) or 1.0
+    lines = [f"{'function':<36} {'calls':>10} {'total_ms':>12} {'own_ms':>12} {'own%':>7} {'per_call_us':>12}"]
+    for label, row in rows:
+        lines.append(f"{label:<36} {row['calls']:>10} {row['total'] * 1e3:>12.3f} {row['own'] * 1e3:>12.3f} "
+                     f"{row['own'] / own_sum:>7.1%} {row['total'] / row['calls'] * 1e6:>12.2f}")
+    return '\n'.join(lines) + '\n'
+
+
+def dump(path, fmt=None):
+    """写出统计：fmt 为 'json'（函数汇总 + 调用栈）或 'collapsed'（折叠栈），默认按扩展名判断"""
+    if fmt is None:
+        fmt = 'json' if path.endswith('.json') else 'collapsed'
+    with open(path, 'w', encoding='utf-8') as f:
+        if fmt == 'json':
+            with _stats_lock:
+                stacks = dict(_stacks)
+            json.dump({'pid': os.getpid(), 'functions': stats(), 'stacks': stacks}, f, ensure_ascii=False, indent=2)
+        else:
+            f.write(collapsed_stacks())
+
+
+def _dump_at_exit():
+    if not _functions:
+        return
+    output = os.environ.get('SDES_PROFILE_OUTPUT')
+    if output:
+        dump(output.replace('{pid}', str(os.getpid())))
+    else:
+        sys.stderr.write(report())
+
+
+if os.environ.get('SDES_PROFILE', '').lower() in ('1', 'true', 'yes', 'on'):
+    enable()
+    atexit.register(_dump_at_exit)
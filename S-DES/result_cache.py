@@ -0,0 +1,118 @@
+# result_cache.py - 重复请求的结果缓存（LRU + TTL，按内存字节数淘汰，可选 SQLite 磁盘后备）
+# 缓存键由规范化后的请求生成：暴力破解按明密文对去重排序，加解密取 (操作, 密钥, 模式, 数据) 的哈希。
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+
+def brute_cache_key(pairs) -> str:
+    """暴力破解缓存键：明密文对去重并排序，与输入顺序、重复行无关"""
+    return "brute:" + ",".join(f"{pt}:{ct}" for pt, ct in sorted(set(pairs)))
+
+
+def crypt_cache_key(op, key, mode, data) -> str:
+    """加解密缓存键：(操作, 密钥, 模式/格式, 数据) 的 SHA-256"""
+    digest = hashlib.sha256()
+    for part in (op, key, mode):
+        digest.update(str(part).encode('utf-8', 'surrogatepass'))
+        digest.update(b'\0')
+    digest.update(data.encode('utf-8', 'surrogatepass') if isinstance(data, str) else bytes(data))
+    return f"{op}:{digest.hexdigest()}"
+
+
+class ResultCache:
+    """线程安全的结果缓存，值须可 JSON 序列化"""
+
+    def __init__(self, max_bytes=64 * 1024 * 1024, ttl=300.0, path=None, max_item_bytes=None):
+        self.max_bytes = max(1, int(max_bytes))
+        self.ttl = float(ttl)
+        self.max_item_bytes = int(max_item_bytes or self.max_bytes // 8)
+        self._items = OrderedDict()  # key -> (value, size, expires)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self._db = None
+        if path:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute("CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, value TEXT, expires REAL)")
+            self._db.execute("DELETE FROM cache WHERE expires <= ?", (time.time(),))
+            self._db.commit()
+
+    def _store(self, key, value, size, expires):
+        old = self._items.pop(key, None)
+        if old is not None:
+            self._bytes -= old[1]
+        self._items[key] = (value, size, expires)
+        self._bytes += size
+        while self._bytes > self.max_bytes and self._items:
+            _, (_, evicted_size, _) = self._items.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def get(self, key):
+        """命中返回缓存值，否则返回 None"""
+        now = time.time()
+        with self._lock:
+            entry = self._items.get(key)
+            if entry is not None:
+                value, _, expires = entry
+                if expires > now:
+                    self._items.move_to_end(key)
+                    self.hits += 1
+                    return value
+                self._bytes -= entry[1]
+                del self._items[key]
+            if self._db is not None:
+                row = self._db.execute("SELECT value, expires FROM cache WHERE key = ?", (key,)).fetchone()
+                if row is not None and row[1] > now:
+                    value = json.loads(row[0])
+                    self._store(key, value, len(key) + len(row[0]), row[1])
+                    self.hits += 1
+                    self.disk_hits += 1
+                    return value
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        """写入缓存；超过单项大小上限的结果不缓存"""
+        text = json.dumps(value, ensure_ascii=False)
+        size = len(key) + len(text)
+        if size > self.max_item_bytes:
+            return
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._store(key, value, size, expires)
+            if self._db is not None:
+                self._db.execute("INSERT OR REPLACE INTO cache (key, value, expires) VALUES (?, ?, ?)",
+                                 (key, text, expires))
+                self._db.commit()
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self._bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM cache")
+                self._db.commit()
+
+    def stats(self) -> dict:
+        """命中/未命中计数与内存占用"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'disk_hits': self.disk_hits,
+                'evictions': self.evictions,
+                'hit_ratio': self.hits / total if total else 0.0,
+                'entries': len(self._items),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
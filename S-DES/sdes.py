@@ -1,5 +1,21 @@
 # sdes.py - S-DES 算法核心实现
 
+import sys
+from functools import lru_cache
+
+import profiling
+
+# 置换表与 S-Box（按作业规范，位序号从 1 开始、最高位在前）
+P10 = [3, 5, 2, 7, 4, 10, 1, 9, 8, 6]
+P8 = [6, 3, 7, 4, 8, 5, 10, 9]
+IP = [2, 6, 3, 1, 4, 8, 5, 7]
+IP_INV = [4, 1, 3, 5, 7, 2, 8, 6]
+EP = [4, 1, 2, 3, 2, 3, 4, 1]
+P4 = [2, 4, 3, 1]
+S1 = [[1, 0, 3, 2], [3, 2, 1, 0], [0, 2, 1, 3], [3, 1, 0, 2]]
+S2 = [[0, 1, 2, 3], [2, 3, 1, 0], [3, 0, 1, 2], [2, 1, 0, 3]]
+
+
 def permute(bit_string, permutation):
     """根据置换表重新排列位字符串"""
     return ''.join([bit_string[i - 1] for i in permutation])
@@ -13,8 +29,7 @@ def left_shift(bit_string, shifts=1):
 def generate_keys(key):
     """生成子密钥 K1 和 K2"""
     # 初始置换 P10
-    p10 = [3, 5, 2, 7, 4, 10, 1, 9, 8, 6]
-    key_p10 = permute(key, p10)
+    key_p10 = permute(key, P10)
 
     # 左移后拆分
     left_half = key_p10[:5]
@@ -23,13 +38,12 @@ def generate_keys(key):
     # 生成 K1：左移 1 位 + P8 置换
     left_half_shifted = left_shift(left_half, 1)
     right_half_shifted = left_shift(right_half, 1)
-    p8_k1 = [6, 3, 7, 4, 8, 5, 10, 9]
-    k1 = permute(left_half_shifted + right_half_shifted, p8_k1)
+    k1 = permute(left_half_shifted + right_half_shifted, P8)
 
     # 生成 K2：直接在原始 P10 左右半部基础上左移 2 位 + P8 置换（非累计）
     left_half_shifted_twice = left_shift(left_half, 2)
     right_half_shifted_twice = left_shift(right_half, 2)
-    k2 = permute(left_half_shifted_twice + right_half_shifted_twice, p8_k1)
+    k2 = permute(left_half_shifted_twice + right_half_shifted_twice, P8)
 
     return k1, k2
 
@@ -47,95 +61,221 @@ def s_box_lookup(bit_segment, s_box):
 def f_function(right_half, subkey):
     """轮函数 F：扩展置换 + 异或 + S-Box + P4 置换"""
     # 扩展置换 E/P（4 位 -> 8 位）
-    ep = [4, 1, 2, 3, 2, 3, 4, 1]
-    expanded = permute(right_half, ep)
+    expanded = permute(right_half, EP)
 
     # 与子密钥异或
     xor_result = bin(int(expanded, 2) ^ int(subkey, 2))[2:].zfill(8)
 
     # S-Box 处理（拆分为两个 4 位段）
-    s1_segment = xor_result[:4]
-    s2_segment = xor_result[4:]
+    s1_output = s_box_lookup(xor_result[:4], S1)
+    s2_output = s_box_lookup(xor_result[4:], S2)
 
-    # S-Box 定义（按作业规范）
-    s1 = [[1, 0, 3, 2], [3, 2, 1, 0], [0, 2, 1, 3], [3, 1, 0, 2]]
-    s2 = [[0, 1, 2, 3], [2, 3, 1, 0], [3, 0, 1, 2], [2, 1, 0, 3]]
+    # P4 置换
+    return permute(s1_output + s2_output, P4)
 
-    s1_output = s_box_lookup(s1_segment, s1)
-    s2_output = s_box_lookup(s2_segment, s2)
 
-    # P4 置换
-    p4 = [2, 4, 3, 1]
-    return permute(s1_output + s2_output, p4)
+# ---------------- 整数版本（预计算查表，无字符串分配） ----------------
 
+def _permute_int(value, permutation, in_bits):
+    """整数版置换：value 视为 in_bits 位（最高位为第 1 位）"""
+    out = 0
+    for pos in permutation:
+        out = (out << 1) | ((value >> (in_bits - pos)) & 1)
+    return out
 
-def encrypt(plaintext, key):
-    """S-DES 加密流程"""
-    # 初始置换 IP
-    ip = [2, 6, 3, 1, 4, 8, 5, 7]
-    plaintext_ip = permute(plaintext, ip)
 
-    # 拆分左右半部分
-    left = plaintext_ip[:4]
-    right = plaintext_ip[4:]
+def _rotl5(half, shifts):
+    """5 位循环左移"""
+    return ((half << shifts) | (half >> (5 - shifts))) & 0x1F
+
+
+def _subkeys_int(key):
+    """整数版子密钥生成，返回 (K1, K2)"""
+    key_p10 = _permute_int(key, P10, 10)
+    left_half, right_half = key_p10 >> 5, key_p10 & 0x1F
+    k1 = _permute_int((_rotl5(left_half, 1) << 5) | _rotl5(right_half, 1), P8, 10)
+    k2 = _permute_int((_rotl5(left_half, 2) << 5) | _rotl5(right_half, 2), P8, 10)
+    return k1, k2
+
+
+def _s_box_p4_int(value):
+    """8 位输入经 S1/S2 查表后做 P4 置换，返回 4 位结果"""
+    s1_in, s2_in = value >> 4, value & 0xF
+    s1_out = S1[((s1_in >> 2) & 2) | (s1_in & 1)][(s1_in >> 1) & 3]
+    s2_out = S2[((s2_in >> 2) & 2) | (s2_in & 1)][(s2_in >> 1) & 3]
+    return _permute_int((s1_out << 2) | s2_out, P4, 4)
+
+
+# 字节索引的 IP / IP^(-1) 查表
+_IP_TABLE = [_permute_int(b, IP, 8) for b in range(256)]
+_IP_INV_TABLE = [_permute_int(b, IP_INV, 8) for b in range(256)]
+
+# 全部 1024 个密钥的子密钥 (K1, K2)
+_SUBKEY_TABLE = [_subkeys_int(k) for k in range(1024)]
+
+# 融合 E/P -> 异或子密钥 -> S-Box -> P4 的轮函数表，下标为 (subkey << 4) | right
+_EP_TABLE = [_permute_int(r, EP, 4) for r in range(16)]
+_S_BOX_P4_TABLE = [_s_box_p4_int(v) for v in range(256)]
+_F_TABLE = [_S_BOX_P4_TABLE[_EP_TABLE[r] ^ sk] for sk in range(256) for r in range(16)]
+
+
+def generate_keys_int(key):
+    """整数版子密钥生成：key 为 0~1023，返回 (K1, K2)"""
+    return _SUBKEY_TABLE[key]
+
+
+def _crypt_int(block, first, second):
+    """两轮 Feistel：first/second 为两轮子密钥"""
+    state = _IP_TABLE[block]
+    left, right = state >> 4, state & 0xF
+    # 第一轮 + 交换（SW）
+    left, right = right, left ^ _F_TABLE[(first << 4) | right]
+    # 第二轮（不交换）
+    left ^= _F_TABLE[(second << 4) | right]
+    return _IP_INV_TABLE[(left << 4) | right]
+
+
+def encrypt_int(block: int, key: int) -> int:
+    """整数版 S-DES 加密：block 为 0~255，key 为 0~1023"""
+    k1, k2 = _SUBKEY_TABLE[key]
+    return _crypt_int(block, k1, k2)
+
+
+def decrypt_int(block: int, key: int) -> int:
+    """整数版 S-DES 解密：子密钥顺序为 K2、K1"""
+    k1, k2 = _SUBKEY_TABLE[key]
+    return _crypt_int(block, k2, k1)
+
+
+def key_to_int(key):
+    """密钥规范化：接受 10 位二进制字符串或 0~1023 的整数"""
+    if isinstance(key, int):
+        if not 0 <= key < 1024:
+            raise ValueError("密钥必须在 0~1023 之间")
+        return key
+    if len(key) != 10 or any(c not in '01' for c in key):
+        raise ValueError("密钥必须是10位二进制")
+    return int(key, 2)
+
+
+class SDESCipher:
+    """绑定单个密钥的 S-DES 加解密器，子密钥与轮函数表只计算一次"""
+
+    def __init__(self, key):
+        self.key = key_to_int(key)
+        self.k1, self.k2 = _SUBKEY_TABLE[self.key]
+        # 该密钥下 256 个分组的加密/解密码本（可直接用于 bytes.translate）
+        self.encrypt_table = bytes([_crypt_int(b, self.k1, self.k2) for b in range(256)])
+        self.decrypt_table = bytes([_crypt_int(b, self.k2, self.k1) for b in range(256)])
+
+    def encrypt_block(self, block: int) -> int:
+        """加密单个 8 位分组"""
+        return self.encrypt_table[block]
 
-    # 生成子密钥
-    k1, k2 = generate_keys(key)
+    def decrypt_block(self, block: int) -> int:
+        """解密单个 8 位分组"""
+        return self.decrypt_table[block]
 
-    # 第一轮：F 函数 + 异或 + 交换（SW）
-    f_output = f_function(right, k1)
-    new_right = bin(int(left, 2) ^ int(f_output, 2))[2:].zfill(4)
-    left, right = right, new_right
+    def encrypt_bytes(self, data) -> bytes:
+        """按字节（ECB）加密，data 为任意支持缓冲区协议的对象"""
+        return bytes(data).translate(self.encrypt_table)
 
-    # 第二轮：F 函数 + 异或（不交换）
-    f_output = f_function(right, k2)
-    new_left = bin(int(left, 2) ^ int(f_output, 2))[2:].zfill(4)
+    def decrypt_bytes(self, data) -> bytes:
+        """按字节（ECB）解密"""
+        return bytes(data).translate(self.decrypt_table)
 
-    # 最终置换 IP^(-1)
-    ip_inv = [4, 1, 3, 5, 7, 2, 8, 6]
-    return permute(new_left + right, ip_inv)
+    def encrypt_into(self, src, dst) -> int:
+        """加密 src 并直接写入可写缓冲区 dst，返回写入字节数"""
+        return _translate_into(src, dst, self.encrypt_table)
+
+    def decrypt_into(self, src, dst) -> int:
+        """解密 src 并直接写入可写缓冲区 dst，返回写入字节数"""
+        return _translate_into(src, dst, self.decrypt_table)
+
+
+# 缓冲区分段大小：只有单段大小的临时对象，与数据总量无关
+INTO_CHUNK_SIZE = 64 * 1024
+
+
+def _translate_into(src, dst, table):
+    """按查表结果把 src 逐段写入 dst（src 与 dst 可为同一缓冲区）"""
+    src_view = memoryview(src).cast('B')
+    dst_view = memoryview(dst).cast('B')
+    n = src_view.nbytes
+    if dst_view.readonly:
+        raise ValueError("输出缓冲区不可写")
+    if dst_view.nbytes < n:
+        raise ValueError("输出缓冲区长度不足")
+    for i in range(0, n, INTO_CHUNK_SIZE):
+        j = min(i + INTO_CHUNK_SIZE, n)
+        dst_view[i:j] = src_view[i:j].tobytes().translate(table)
+    return n
+
+
+CIPHER_CACHE_SIZE = 256
+
+
+@lru_cache(maxsize=CIPHER_CACHE_SIZE)
+def _cached_cipher(key):
+    return SDESCipher(key)
+
+
+def get_cipher(key):
+    """获取密钥对应的 SDESCipher（LRU 缓存，同一密钥不重复计算子密钥）"""
+    return _cached_cipher(key_to_int(key))
+
+
+def encrypt(plaintext, key):
+    """S-DES 加密流程（二进制字符串接口）"""
+    return f"{encrypt_int(int(plaintext, 2), int(key, 2)):08b}"
 
 
 def decrypt(ciphertext, key):
     """S-DES 解密流程（与加密对称，子密钥顺序为 K2、K1）"""
-    ip = [2, 6, 3, 1, 4, 8, 5, 7]
-    ciphertext_ip = permute(ciphertext, ip)
-
-    left = ciphertext_ip[:4]
-    right = ciphertext_ip[4:]
-
-    k1, k2 = generate_keys(key)
-
-    # 第一轮用 K2，然后交换（SW）
-    f_output = f_function(right, k2)
-    new_right = bin(int(left, 2) ^ int(f_output, 2))[2:].zfill(4)
-    left, right = right, new_right
-
-    # 第二轮用 K1（不交换）
-    f_output = f_function(right, k1)
-    new_left = bin(int(left, 2) ^ int(f_output, 2))[2:].zfill(4)
-
-    ip_inv = [4, 1, 3, 5, 7, 2, 8, 6]
-    return permute(new_left + right, ip_inv)
-
-
-def encrypt_text(text, key):
-    """ASCII 字符串加密（按字节分组）"""
-    ciphertext = ""
-    for char in text:
-        # 字符转 8 位二进制
-        char_bin = f"{ord(char):08b}"
-        # 加密后转字符
-        cipher_bin = encrypt(char_bin, key)
-        ciphertext += chr(int(cipher_bin, 2))
-    return ciphertext
-
-
-def decrypt_text(ciphertext, key):
-    """ASCII 字符串解密（按字节分组）"""
-    plaintext = ""
-    for char in ciphertext:
-        char_bin = f"{ord(char):08b}"
-        plain_bin = decrypt(char_bin, key)
-        plaintext += chr(int(plain_bin, 2))
-    return plaintext
\ No newline at end of file
+    return f"{decrypt_int(int(ciphertext, 2), int(key, 2)):08b}"
+
+
+def encrypt_bytes(data, key) -> bytes:
+    """字节串加密（按字节分组），data 可为 bytes/bytearray/memoryview/mmap"""
+    return get_cipher(key).encrypt_bytes(data)
+
+
+def decrypt_bytes(data, key) -> bytes:
+    """字节串解密（按字节分组）"""
+    return get_cipher(key).decrypt_bytes(data)
+
+
+def encrypt_into(src, dst, key) -> int:
+    """加密 src 并直接写入可写缓冲区 dst，返回写入字节数"""
+    return get_cipher(key).encrypt_into(src, dst)
+
+
+def decrypt_into(src, dst, key) -> int:
+    """解密 src 并直接写入可写缓冲区 dst，返回写入字节数"""
+    return get_cipher(key).decrypt_into(src, dst)
+
+
+def encrypt_text(text, key, encoding='utf-8'):
+    """文本加密：按 encoding 编码后逐字节加密，密文每个字节对应一个字符（0~255）"""
+    return encrypt_bytes(text.encode(encoding), key).decode('latin-1')
+
+
+def decrypt_text(ciphertext, key, encoding='utf-8', errors='strict'):
+    """文本解密：密文字符须在 0~255 之间，解密后按 encoding 解码（默认遇到非法字节抛出 UnicodeDecodeError）"""
+    return decrypt_bytes(ciphertext.encode('latin-1'), key).decode(encoding, errors)
+
+
+# 可选插桩（SDES_PROFILE=1 或 profiling.profile()），未开启时不做任何包装
+PROFILED_FUNCTIONS = (
+    "permute", "left_shift", "generate_keys", "s_box_lookup", "f_function",
+    "generate_keys_int", "_crypt_int", "encrypt_int", "decrypt_int",
+    "get_cipher", "encrypt", "decrypt", "encrypt_bytes", "decrypt_bytes",
+    "encrypt_into", "decrypt_into", "encrypt_text", "decrypt_text",
+)
+profiling.register(sys.modules[__name__], PROFILED_FUNCTIONS)
+
+
+if __name__ == "__main__":
+    # python -m sdes：命令行工具（见 cli.py）
+    import cli
+    sys.exit(cli.main())
@@ -1,10 +1,22 @@
 # sdes_gui.py - S-DES 算法图形界面
 
 import tkinter as tk
-from tkinter import ttk, messagebox, scrolledtext
+from tkinter import ttk, messagebox, scrolledtext, filedialog
 import sdes
 import brute_force
+import codecs
+import os
+import queue
 import sys
+import threading
+import time
+
+TOTAL_KEYS = brute_force.TOTAL_KEYS
+POLL_INTERVAL_MS = 50     # 主线程轮询后台消息队列的间隔
+CRYPT_CHUNK_SIZE = 64 * 1024   # 文本加解密每块处理的字节数，逐块追加到输出框
+CRYPT_QUEUE_SIZE = 4           # 后台输出队列上限：主线程来不及插入时后台线程阻塞等待
+FILE_CHUNK_SIZE = 1 << 20      # 文件加解密每次读写的字节数
+_BIN_STRINGS = [f"{b:08b}" for b in range(256)]
 
 # 设置高DPI感知，解决字体模糊问题
 if sys.platform == "win32":
@@ -272,6 +284,60 @@ class SDesGUI:
         clear_btn.bind("<Enter>", lambda e: clear_btn.config(bg='#616161'))
         clear_btn.bind("<Leave>", lambda e: clear_btn.config(bg='#757575'))
 
+        file_encrypt_btn = tk.Button(
+            btn_container,
+            text="文件加密",
+            command=lambda: self.crypt_file(decrypt=False),
+            font=("Microsoft YaHei", 12, "bold"),
+            bg='#009688',
+            fg='white',
+            relief="flat",
+            padx=25,
+            pady=8,
+            cursor="hand2"
+        )
+        file_encrypt_btn.pack(side=tk.LEFT, padx=8)
+        file_encrypt_btn.bind("<Enter>", lambda e: file_encrypt_btn.config(bg='#00796B'))
+        file_encrypt_btn.bind("<Leave>", lambda e: file_encrypt_btn.config(bg='#009688'))
+
+        file_decrypt_btn = tk.Button(
+            btn_container,
+            text="文件解密",
+            command=lambda: self.crypt_file(decrypt=True),
+            font=("Microsoft YaHei", 12, "bold"),
+            bg='#3F51B5',
+            fg='white',
+            relief="flat",
+            padx=25,
+            pady=8,
+            cursor="hand2"
+        )
+        file_decrypt_btn.pack(side=tk.LEFT, padx=8)
+        file_decrypt_btn.bind("<Enter>", lambda e: file_decrypt_btn.config(bg='#303F9F'))
+        file_decrypt_btn.bind("<Leave>", lambda e: file_decrypt_btn.config(bg='#3F51B5'))
+
+        # 处理期间禁用的按钮
+        self.crypt_buttons = [encrypt_btn, decrypt_btn, clear_btn, file_encrypt_btn, file_decrypt_btn]
+
+        # 进度区域（文本分块处理、文件加解密）
+        progress_frame = tk.Frame(parent, bg='#ffffff')
+        progress_frame.pack(fill="x", padx=30, pady=(0, 5))
+
+        self.crypt_progress = ttk.Progressbar(progress_frame, maximum=100, mode="determinate")
+        self.crypt_progress.pack(fill="x", expand=True, side=tk.LEFT)
+
+        self.crypt_status_label = tk.Label(
+            progress_frame,
+            text="",
+            width=40,
+            anchor="e",
+            font=("Consolas", 11),
+            fg='#666666',
+            bg='#ffffff'
+        )
+        self.crypt_status_label.pack(side=tk.LEFT, padx=(10, 0))
+        self.crypt_queue = None
+
         # 创建输出区域
         output_frame = ttk.LabelFrame(parent, text="输出结果", style="Custom.TLabelframe")
         output_frame.pack(fill="both", expand=True, padx=20, pady=15)
@@ -367,6 +433,19 @@ class SDesGUI:
         )
         perf_label.grid(row=3, column=2, padx=10, pady=10, sticky="w")
 
+        # 找到一个即停止
+        self.first_match_var = tk.BooleanVar(value=False)
+        first_match_check = tk.Checkbutton(
+            input_frame,
+            text="找到第一个匹配的密钥即停止",
+            variable=self.first_match_var,
+            font=("Microsoft YaHei", 11),
+            fg='#333333',
+            bg='#ffffff',
+            activebackground='#ffffff'
+        )
+        first_match_check.grid(row=4, column=0, columnspan=3, padx=10, pady=(0, 10), sticky="w")
+
         # 创建按钮区域
         button_frame = tk.Frame(parent, bg='#ffffff')
         button_frame.pack(fill="x", expand=True, padx=20, pady=15)
@@ -389,6 +468,25 @@ class SDesGUI:
         start_btn.pack(side=tk.LEFT, padx=8)
         start_btn.bind("<Enter>", lambda e: start_btn.config(bg='#d32f2f'))
         start_btn.bind("<Leave>", lambda e: start_btn.config(bg='#f44336'))
+        self.brute_start_btn = start_btn
+
+        cancel_btn = tk.Button(
+            btn_container,
+            text="取消",
+            command=self.cancel_brute_force,
+            state="disabled",
+            font=("Microsoft YaHei", 12, "bold"),
+            bg='#FF9800',
+            fg='white',
+            relief="flat",
+            padx=25,
+            pady=8,
+            cursor="hand2"
+        )
+        cancel_btn.pack(side=tk.LEFT, padx=8)
+        cancel_btn.bind("<Enter>", lambda e: cancel_btn.config(bg='#F57C00'))
+        cancel_btn.bind("<Leave>", lambda e: cancel_btn.config(bg='#FF9800'))
+        self.brute_cancel_btn = cancel_btn
 
         clear_btn = tk.Button(
             btn_container,
@@ -405,6 +503,31 @@ class SDesGUI:
         clear_btn.pack(side=tk.LEFT, padx=8)
         clear_btn.bind("<Enter>", lambda e: clear_btn.config(bg='#616161'))
         clear_btn.bind("<Leave>", lambda e: clear_btn.config(bg='#757575'))
+        self.brute_clear_btn = clear_btn
+
+        # 进度区域
+        progress_frame = tk.Frame(parent, bg='#ffffff')
+        progress_frame.pack(fill="x", padx=30, pady=(0, 5))
+
+        self.brute_progress = ttk.Progressbar(progress_frame, maximum=TOTAL_KEYS, mode="determinate")
+        self.brute_progress.pack(fill="x", expand=True, side=tk.LEFT)
+
+        self.brute_status_label = tk.Label(
+            progress_frame,
+            text=f"0 / {TOTAL_KEYS}",
+            width=28,
+            anchor="e",
+            font=("Consolas", 11),
+            fg='#666666',
+            bg='#ffffff'
+        )
+        self.brute_status_label.pack(side=tk.LEFT, padx=(10, 0))
+
+        # 后台破解状态
+        self.brute_queue = None
+        self.brute_cancel_event = None
+        self.brute_pairs_running = []
+        self.brute_matches = []
 
         # 创建结果区域
         result_frame = ttk.LabelFrame(parent, text="破解结果", style="Custom.TLabelframe")
@@ -469,88 +592,175 @@ class SDesGUI:
 
     def encrypt(self):
         """加密功能"""
-        input_str = self.input_text.get("1.0", tk.END).strip()
-        key = self.key_entry.get().strip()
-        mode = self.mode_var.get()
+        self._start_text_crypt(decrypt=False)
 
-        # 检查占位符文本
-        if input_str == "请输入要加密/解密的内容...":
-            messagebox.showwarning("提示", "请输入要加密的内容！")
-            return
+    def decrypt(self):
+        """解密功能"""
+        self._start_text_crypt(decrypt=True)
 
+    def _read_key(self):
+        """读取并校验密钥，不合法时提示并返回 None"""
+        key = self.key_entry.get().strip()
         if not key or len(key) != 10 or not all(bit in "01" for bit in key):
             messagebox.showerror("错误", "密钥必须是 10 位二进制！")
-            return
-
-        try:
-            if mode == "binary":
-                if not all(bit in "01" for bit in input_str.replace(" ", "")):
-                    messagebox.showerror("错误", "二进制输入只能包含 0 和 1！")
-                    return
-                # 移除空格并确保是8位的倍数
-                input_str = input_str.replace(" ", "")
-                if len(input_str) % 8 != 0:
-                    messagebox.showerror("错误", "二进制输入长度必须是 8 的倍数！")
-                    return
-
-                result = ""
-                for i in range(0, len(input_str), 8):
-                    block = input_str[i:i + 8]
-                    result += sdes.encrypt(block, key) + " "
-                result = result.strip()
-            else:
-                # ASCII模式：输出为原始 ASCII 密文（可能不可见/乱码）
-                result = sdes.encrypt_text(input_str, key)
-
-            self.output_text.config(state="normal")
-            self.output_text.delete("1.0", tk.END)
-            self.output_text.insert("1.0", result)
-            self.output_text.config(state="disabled")
-        except Exception as e:
-            messagebox.showerror("错误", f"加密失败：{str(e)}")
+            return None
+        return key
 
-    def decrypt(self):
-        """解密功能"""
+    def _start_text_crypt(self, decrypt):
+        """读取输入框内容，交给后台线程分块处理，结果逐块追加到输出框"""
+        action = "解密" if decrypt else "加密"
         input_str = self.input_text.get("1.0", tk.END).strip()
-        key = self.key_entry.get().strip()
-        mode = self.mode_var.get()
 
         # 检查占位符文本
         if input_str == "请输入要加密/解密的内容...":
-            messagebox.showwarning("提示", "请输入要解密的内容！")
+            messagebox.showwarning("提示", f"请输入要{action}的内容！")
             return
 
-        if not key or len(key) != 10 or not all(bit in "01" for bit in key):
-            messagebox.showerror("错误", "密钥必须是 10 位二进制！")
+        key = self._read_key()
+        if key is None or self.crypt_queue is not None:
             return
 
+        self.output_text.config(state="normal")
+        self.output_text.delete("1.0", tk.END)
+        self.output_text.config(state="disabled")
+        self._start_crypt_worker(self._text_crypt_worker, (input_str, key, self.mode_var.get(), decrypt))
+
+    def crypt_file(self, decrypt):
+        """文件加解密：直接在文件之间按块处理，不经过文本框"""
+        if self.crypt_queue is not None:
+            return
+        key = self._read_key()
+        if key is None:
+            return
+        action = "解密" if decrypt else "加密"
+        src = filedialog.askopenfilename(title=f"选择要{action}的文件")
+        if not src:
+            return
+        dst = filedialog.asksaveasfilename(title=f"{action}结果保存为",
+                                           initialfile=os.path.basename(src) + (".dec" if decrypt else ".enc"))
+        if not dst:
+            return
+        if os.path.exists(dst) and os.path.samefile(src, dst):
+            messagebox.showerror("错误", "输出文件不能与输入文件相同！")
+            return
+        self._start_crypt_worker(self._file_crypt_worker, (src, dst, key, decrypt))
+
+    def _start_crypt_worker(self, target, args):
+        self.crypt_queue = queue.Queue(maxsize=CRYPT_QUEUE_SIZE)
+        for btn in self.crypt_buttons:
+            btn.config(state="disabled")
+        self.crypt_progress.config(value=0)
+        self.crypt_status_label.config(text="处理中...")
+        threading.Thread(target=target, args=args + (self.crypt_queue,), daemon=True).start()
+        self.root.after(POLL_INTERVAL_MS, self._poll_crypt)
+
+    @staticmethod
+    def _text_crypt_worker(input_str, key, mode, decrypt, out_queue):
+        """后台线程：按块加解密文本，每块结果放入队列"""
+        action = "解密" if decrypt else "加密"
+        start_time = time.time()
         try:
+            cipher = sdes.get_cipher(key)
+            crypt = cipher.decrypt_bytes if decrypt else cipher.encrypt_bytes
             if mode == "binary":
-                if not all(bit in "01 " for bit in input_str):
-                    messagebox.showerror("错误", "二进制输入只能包含 0、1 和空格！")
-                    return
                 # 移除空格并确保是8位的倍数
-                input_str = input_str.replace(" ", "")
-                if len(input_str) % 8 != 0:
-                    messagebox.showerror("错误", "二进制输入长度必须是 8 的倍数！")
+                bits = input_str.replace(" ", "")
+                if bits.translate({ord("0"): None, ord("1"): None}):
+                    out_queue.put(("invalid", "二进制输入只能包含 0、1 和空格！"))
                     return
-
-                result = ""
-                for i in range(0, len(input_str), 8):
-                    block = input_str[i:i + 8]
-                    result += sdes.decrypt(block, key) + " "
-                result = result.strip()
+                if len(bits) % 8 != 0:
+                    out_queue.put(("invalid", "二进制输入长度必须是 8 的倍数！"))
+                    return
+                total, step = len(bits), CRYPT_CHUNK_SIZE * 8
+                for i in range(0, total, step):
+                    part = bits[i:i + step]
+                    out = crypt(int(part, 2).to_bytes(len(part) // 8, "big"))
+                    text = " ".join(map(_BIN_STRINGS.__getitem__, out))
+                    out_queue.put(("output", (" " if i else "") + text, i + len(part), total))
+            elif decrypt:
+                # ASCII模式：输入为原始 ASCII 密文，按块解密后增量解码为明文（多字节字符可跨块）
+                decoder = codecs.getincrementaldecoder("utf-8")("replace")
+                total = len(input_str)
+                for i in range(0, total, CRYPT_CHUNK_SIZE):
+                    part = input_str[i:i + CRYPT_CHUNK_SIZE]
+                    text = decoder.decode(crypt(part.encode("latin-1")), final=i + CRYPT_CHUNK_SIZE >= total)
+                    out_queue.put(("output", text, i + len(part), total))
             else:
-                # ASCII模式：输入为原始 ASCII 密文，输出为可读明文
-                result_text = sdes.decrypt_text(input_str, key)
-                result = result_text
-
-            self.output_text.config(state="normal")
-            self.output_text.delete("1.0", tk.END)
-            self.output_text.insert("1.0", result)
-            self.output_text.config(state="disabled")
+                # ASCII模式：输出为原始 ASCII 密文（可能不可见/乱码）
+                data = input_str.encode("utf-8")
+                total = len(data)
+                for i in range(0, total, CRYPT_CHUNK_SIZE):
+                    part = data[i:i + CRYPT_CHUNK_SIZE]
+                    out_queue.put(("output", crypt(part).decode("latin-1"), i + len(part), total))
+            out_queue.put(("done", f"{action}完成，耗时 {time.time() - start_time:.3f} 秒"))
         except Exception as e:
-            messagebox.showerror("错误", f"解密失败：{str(e)}")
+            out_queue.put(("error", f"{action}失败：{str(e)}"))
+
+    @staticmethod
+    def _file_crypt_worker(src, dst, key, decrypt, out_queue):
+        """后台线程：按块读取 src、加解密后写入 dst（按字节分组，与 sdes.encrypt_bytes 一致）"""
+        action = "解密" if decrypt else "加密"
+        start_time = time.time()
+        try:
+            cipher = sdes.get_cipher(key)
+            crypt = cipher.decrypt_bytes if decrypt else cipher.encrypt_bytes
+            total = os.path.getsize(src)
+            done = 0
+            with open(src, "rb") as fin, open(dst, "wb") as fout:
+                while True:
+                    chunk = fin.read(FILE_CHUNK_SIZE)
+                    if not chunk:
+                        break
+                    fout.write(crypt(chunk))
+                    done += len(chunk)
+                    out_queue.put(("progress", done, total))
+            out_queue.put(("done", f"{action}完成：{done} 字节 -> {os.path.basename(dst)}，"
+                                   f"耗时 {time.time() - start_time:.3f} 秒"))
+        except Exception as e:
+            out_queue.put(("error", f"{action}失败：{str(e)}"))
+
+    def _poll_crypt(self):
+        """主线程：追加后台输出并更新进度；每次最多插入一块输出，避免单次回调长时间占用界面"""
+        finished = False
+        inserted = False
+        try:
+            while True:
+                message = self.crypt_queue.get_nowait()
+                kind = message[0]
+                if kind == "output":
+                    _, text, done, total = message
+                    self.output_text.config(state="normal")
+                    self.output_text.insert(tk.END, text)
+                    self.output_text.config(state="disabled")
+                    self._update_crypt_progress(done, total)
+                    inserted = True
+                    break
+                elif kind == "progress":
+                    self._update_crypt_progress(message[1], message[2])
+                else:
+                    finished = True
+                    if kind == "done":
+                        self.crypt_progress.config(value=100)
+                        self.crypt_status_label.config(text=message[1])
+                    else:
+                        self.crypt_status_label.config(text="")
+                        messagebox.showerror("错误", message[1])
+                    break
+        except queue.Empty:
+            pass
+
+        if finished:
+            self.crypt_queue = None
+            for btn in self.crypt_buttons:
+                btn.config(state="normal")
+        else:
+            # 刚插入过输出时队列里多半还有后续块，尽快再次轮询
+            self.root.after(1 if inserted else POLL_INTERVAL_MS, self._poll_crypt)
+
+    def _update_crypt_progress(self, done, total):
+        percent = done * 100 / total if total else 100
+        self.crypt_progress.config(value=percent)
+        self.crypt_status_label.config(text=f"{percent:.0f}%")
 
     def run_brute_force(self):
         """执行暴力破解（支持多对 + 多线程）"""
@@ -575,36 +785,109 @@ class SDesGUI:
             pairs.append((pt, ct))
 
         threads = max(1, int(self.thread_var.get()))
+        if self.brute_queue is not None:
+            return  # 上一次破解仍在进行
 
-        # 显示正在破解
+        # 显示正在破解，后续结果逐步追加
         self.brute_result_text.config(state="normal")
         self.brute_result_text.delete("1.0", tk.END)
-        self.brute_result_text.insert("1.0", f"正在破解（{len(pairs)} 对, {threads} 线程）...\n")
+        self.brute_result_text.insert("1.0", f"正在破解（{len(pairs)} 对, {threads} 线程）...\n\n匹配的密钥:\n")
         self.brute_result_text.config(state="disabled")
-        self.root.update()
-
-        # 执行暴力破解
-        matched_keys, elapsed_time = brute_force.brute_force_multi(pairs, threads=threads)
+        self.brute_progress.config(value=0)
+        self.brute_status_label.config(text=f"0 / {TOTAL_KEYS}")
+        self.brute_start_btn.config(state="disabled")
+        self.brute_clear_btn.config(state="disabled")
+        self.brute_cancel_btn.config(state="normal")
+
+        # 搜索在后台线程中进行，主线程只轮询消息队列，窗口保持响应
+        self.brute_pairs_running = pairs
+        self.brute_matches = []
+        self.brute_queue = queue.Queue()
+        self.brute_cancel_event = threading.Event()
+        threading.Thread(
+            target=self._brute_worker,
+            args=(pairs, threads, self.first_match_var.get(), self.brute_cancel_event, self.brute_queue),
+            daemon=True
+        ).start()
+        self.root.after(POLL_INTERVAL_MS, self._poll_brute_force)
+
+    @staticmethod
+    def _brute_worker(pairs, threads, first_match_only, cancel_event, out_queue):
+        """后台线程：分批搜索密钥（批次之间检查取消），每轮把进度与新匹配的密钥放入队列"""
+        start_time = time.time()
+        try:
+            result = brute_force.brute_force_multi(
+                pairs, threads=threads, use_index=False,
+                progress=lambda tried, total, keys: out_queue.put(("progress", tried, keys, time.time() - start_time)),
+                cancel_event=cancel_event, first_match_only=first_match_only)
+            out_queue.put(("done", result.tried, result.cancelled, result.elapsed))
+        except Exception as e:
+            out_queue.put(("error", str(e)))
 
-        # 显示结果
+    def _poll_brute_force(self):
+        """主线程：取出后台消息更新进度条、速度与匹配列表"""
+        finished = False
         self.brute_result_text.config(state="normal")
-        self.brute_result_text.delete("1.0", tk.END)
-        self.brute_result_text.insert("1.0", f"完成，耗时: {elapsed_time:.4f} 秒\n")
-        self.brute_result_text.insert(tk.END, f"找到的匹配密钥数量: {len(matched_keys)}\n\n")
+        try:
+            while True:
+                message = self.brute_queue.get_nowait()
+                if message[0] == "progress":
+                    _, tried, keys, elapsed = message
+                    self.brute_progress.config(value=tried)
+                    rate = tried / elapsed if elapsed > 0 else 0.0
+                    self.brute_status_label.config(text=f"{tried} / {TOTAL_KEYS}  {rate:,.0f} keys/s")
+                    for k in keys:
+                        self.brute_result_text.insert(tk.END, f"- {k}\n")
+                        self.brute_matches.append(k)
+                elif message[0] == "done":
+                    _, tried, cancelled, elapsed = message
+                    self._show_brute_summary(tried, cancelled, elapsed)
+                    finished = True
+                    break
+                else:
+                    self.brute_result_text.insert(tk.END, f"\n破解失败：{message[1]}\n")
+                    finished = True
+                    break
+        except queue.Empty:
+            pass
+        self.brute_result_text.see(tk.END)
+        self.brute_result_text.config(state="disabled")
+
+        if finished:
+            self.brute_queue = None
+            self.brute_cancel_event = None
+            self.brute_start_btn.config(state="normal")
+            self.brute_clear_btn.config(state="normal")
+            self.brute_cancel_btn.config(state="disabled")
+        else:
+            self.root.after(POLL_INTERVAL_MS, self._poll_brute_force)
+
+    def _show_brute_summary(self, tried, cancelled, elapsed):
+        """破解结束后追加汇总与验证结果"""
+        matched_keys = self.brute_matches
+        pairs = self.brute_pairs_running
+        if not matched_keys:
+            self.brute_result_text.insert(tk.END, "（无）\n")
+        if cancelled:
+            self.brute_result_text.insert(tk.END, f"\n已取消：已尝试 {tried} / {TOTAL_KEYS} 个密钥，耗时 {elapsed:.4f} 秒\n")
+        else:
+            self.brute_result_text.insert(tk.END, f"\n完成，耗时: {elapsed:.4f} 秒\n")
+        self.brute_result_text.insert(tk.END, f"找到的匹配密钥数量: {len(matched_keys)}\n")
 
         if matched_keys:
-            self.brute_result_text.insert(tk.END, "匹配的密钥:\n")
-            for k in matched_keys:
-                self.brute_result_text.insert(tk.END, f"- {k}\n")
             # 验证
             self.brute_result_text.insert(tk.END, "\n验证:\n")
             for k in matched_keys:
                 ok = all(sdes.encrypt(pt, k) == ct for pt, ct in pairs)
                 self.brute_result_text.insert(tk.END, f"{k} -> {'成功' if ok else '失败'}\n")
-        else:
+        elif not cancelled:
             self.brute_result_text.insert(tk.END, "未找到匹配的密钥。")
 
-        self.brute_result_text.config(state="disabled")
+    def cancel_brute_force(self):
+        """取消正在进行的破解（后台线程在下一批之前停止）"""
+        if self.brute_cancel_event is not None:
+            self.brute_cancel_event.set()
+            self.brute_cancel_btn.config(state="disabled")
 
     def clear_fields(self):
         """清空输入输出字段"""
@@ -0,0 +1,20 @@
+# test_bitslice.py - 位切片搜索与字符串参考实现的一致性检查
+# 运行：python test_bitslice.py（也可直接交给 pytest）
+
+import bitslice
+from test_sdes import reference_table
+
+
+def test_bitslice_search():
+    """每个明文取一个密文，位切片搜索结果与参考实现的匹配密钥集合一致"""
+    table = reference_table()
+    for block in range(256):
+        ct = table[((block * 37) % 1024 << 8) | block]
+        expected = [key for key in range(1024) if table[(key << 8) | block] == ct]
+        assert bitslice.search([(block, ct)]) == expected, block
+        assert bitslice.search([(block, ct)], 300, 700) == [k for k in expected if 300 <= k < 700], block
+
+
+if __name__ == "__main__":
+    test_bitslice_search()
+    print("test_bitslice_search: 通过")
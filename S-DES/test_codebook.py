@@ -0,0 +1,26 @@
+# test_codebook.py - 全码本与字符串参考实现的穷举一致性检查
+# 运行：python test_codebook.py（也可直接交给 pytest）
+
+import os
+
+# 不把码本文件写入用户缓存目录
+os.environ['SDES_CODEBOOK_PATH'] = ''
+
+import codebook
+from test_sdes import reference_table
+
+
+def test_codebook():
+    """码本 lookup / lookup_inverse 与参考实现一致"""
+    table = reference_table()
+    assert bytes(codebook.encrypt_codebook()) == table
+    for key in range(1024):
+        for block in range(256):
+            ct = table[(key << 8) | block]
+            assert codebook.lookup(key, block) == ct, (key, block)
+            assert codebook.lookup_inverse(key, ct) == block, (key, block)
+
+
+if __name__ == "__main__":
+    test_codebook()
+    print("test_codebook: 通过")
@@ -0,0 +1,149 @@
+# test_modes.py - 工作模式与逐字节参考实现的一致性、已知答案及分块无关性检查
+# 运行：python test_modes.py（也可直接交给 pytest）
+
+import random
+
+import modes
+import sdes
+
+KEY = "1100110011"
+IV = 0x5A
+PLAINTEXT = b"S-DES modes test"
+
+# 已知答案：由下面的逐字节参考实现算出（key=1100110011, iv=0x5A）
+KNOWN_ANSWERS = {
+    "ecb": "6ff27e746f07660fd61cc307aa1cc3aa",
+    "cbc": "3f829bfb5e15d34407f0fa9e3d7b5042",
+    "cfb": "ab91d670b8c1daf1ca302818bfff7de5",
+    "ofb": "abb8b3a5a6cfa426eb34139345396df9",
+    "ctr": "ab485abc2ee0def694c5a53c01609f57",
+}
+
+
+def reference_encrypt(data, key, mode, iv):
+    """逐字节参考实现：直接按各模式定义调用 encrypt_int，不做任何批量优化"""
+    k = int(key, 2)
+    out = bytearray()
+    prev, state = iv, iv
+    for i, b in enumerate(data):
+        if mode == "ecb":
+            c = sdes.encrypt_int(b, k)
+        elif mode == "cbc":
+            c = prev = sdes.encrypt_int(b ^ prev, k)
+        elif mode == "cfb":
+            c = prev = b ^ sdes.encrypt_int(prev, k)
+        elif mode == "ofb":
+            state = sdes.encrypt_int(state, k)
+            c = b ^ state
+        else:
+            c = b ^ sdes.encrypt_int((iv + i) % 256, k)
+        out.append(c)
+    return bytes(out)
+
+
+def reference_decrypt(data, key, mode, iv):
+    """逐字节参考解密"""
+    k = int(key, 2)
+    out = bytearray()
+    prev = iv
+    if mode in ("ofb", "ctr"):
+        return reference_encrypt(data, key, mode, iv)
+    for c in data:
+        if mode == "ecb":
+            out.append(sdes.decrypt_int(c, k))
+        elif mode == "cbc":
+            out.append(sdes.decrypt_int(c, k) ^ prev)
+        else:
+            out.append(c ^ sdes.encrypt_int(prev, k))
+        prev = c
+    return bytes(out)
+
+
+def _chunked(ctx, data, sizes):
+    """按 sizes 循环切分 data 逐块 update"""
+    out, i, n = [], 0, 0
+    while i < len(data):
+        size = sizes[n % len(sizes)]
+        out.append(ctx.update(data[i:i + size]))
+        i += size
+        n += 1
+    out.append(ctx.finalize())
+    return b"".join(out)
+
+
+def test_known_answers():
+    """各模式的已知答案，加密后能解密回原文"""
+    for mode, expected in KNOWN_ANSWERS.items():
+        ct = modes.encrypt(PLAINTEXT, KEY, mode, IV)
+        assert ct.hex() == expected, mode
+        assert modes.decrypt(ct, KEY, mode, IV) == PLAINTEXT, mode
+
+
+def test_reference_round_trip():
+    """随机数据、全部 IV 下与逐字节参考实现一致（覆盖 CTR 计数器与 OFB 轨道回绕）"""
+    rng = random.Random(1)
+    for mode in modes.MODES:
+        for iv in range(256):
+            key = f"{rng.randrange(1024):010b}"
+            data = bytes(rng.randrange(256) for _ in range(rng.randrange(1, 700)))
+            ct = modes.encrypt(data, key, mode, iv)
+            assert ct == reference_encrypt(data, key, mode, iv), (mode, iv)
+            assert modes.decrypt(ct, key, mode, iv) == data, (mode, iv)
+            assert reference_decrypt(ct, key, mode, iv) == data, (mode, iv)
+
+
+def test_ctr_counter_wrap():
+    """CTR 计数器为 8 位：iv=0xFF 时第 2 个分组使用计数器 0，周期为 256"""
+    cipher = sdes.get_cipher(KEY)
+    stream = modes.ctr_keystream(KEY, 0xFF, 0, 513)
+    assert stream[0] == cipher.encrypt_block(0xFF)
+    assert stream[1] == cipher.encrypt_block(0x00)
+    assert stream[:257] == stream[256:]
+    assert modes.ctr_keystream(KEY, bytes([0xFF]), 300, 50) == stream[300:350]
+
+
+def test_ofb_keystream_offset():
+    """OFB 密钥流可从任意偏移开始，与从头生成后截取一致"""
+    stream = modes.ofb_keystream(KEY, IV, 0, 1200)
+    for offset in (0, 1, 255, 256, 257, 999):
+        assert modes.ofb_keystream(KEY, IV, offset, 100) == stream[offset:offset + 100]
+
+
+def test_split_invariance():
+    """任意分块方式（含空块、单字节块）下输出与一次性处理相同"""
+    rng = random.Random(2)
+    data = bytes(rng.randrange(256) for _ in range(1500))
+    splits = ([1], [7], [3, 1, 64], [255, 256, 1], [1024], [2000])
+    for mode in modes.MODES:
+        whole = modes.encrypt(data, KEY, mode, IV)
+        for sizes in splits:
+            assert _chunked(modes.encryptor(KEY, mode, IV), data, sizes) == whole, (mode, sizes)
+            assert _chunked(modes.decryptor(KEY, mode, IV), whole, sizes) == data, (mode, sizes)
+        ctx = modes.encryptor(KEY, mode, IV)
+        assert ctx.update(b"") == b"" and ctx.update(data) == whole, mode
+
+
+def test_iv_validation():
+    """IV 只接受 0~255 的整数或 1 字节 bytes；finalize 之后不能再 update"""
+    assert modes.normalize_iv(bytes([7])) == 7
+    for bad in (-1, 256, b"", b"\x00\x01"):
+        try:
+            modes.encryptor(KEY, "cbc", bad)
+        except ValueError:
+            continue
+        raise AssertionError(f"IV {bad!r} 应被拒绝")
+    ctx = modes.encryptor(KEY, "ctr", IV)
+    ctx.finalize()
+    try:
+        ctx.update(b"x")
+    except ValueError:
+        return
+    raise AssertionError("finalize 之后 update 应失败")
+
+
+if __name__ == "__main__":
+    tests = [test_known_answers, test_reference_round_trip, test_ctr_counter_wrap,
+             test_ofb_keystream_offset, test_split_invariance, test_iv_validation]
+    for test in tests:
+        test()
+        print(f"{test.__name__}: 通过")
@@ -0,0 +1,23 @@
+# test_vectorized.py - NumPy 全码本矩阵与字符串参考实现的穷举一致性检查
+# 运行：python test_vectorized.py（也可直接交给 pytest）
+
+import os
+
+# 不把码本文件写入用户缓存目录
+os.environ['SDES_CODEBOOK_PATH'] = ''
+
+import vectorized
+from test_sdes import reference_table
+
+
+def test_vectorized_codebook_matrix():
+    """NumPy 全码本矩阵与参考实现一致（未安装 NumPy 时跳过）"""
+    if not vectorized.HAVE_NUMPY:
+        print("跳过 vectorized：未安装 numpy")
+        return
+    assert vectorized.codebook_matrix().tobytes() == reference_table()
+
+
+if __name__ == "__main__":
+    test_vectorized_codebook_matrix()
+    print("test_vectorized_codebook_matrix: 通过")
@@ -0,0 +1,125 @@
+# vectorized.py - S-DES 批量（NumPy 向量化）计算
+# 输入 uint8 分组数组与 uint16 密钥数组，按 NumPy 广播规则返回密文数组。
+# 未安装 NumPy 时，encrypt_all_keys / keys_matching 退回全码本查表，其余接口抛出 ImportError。
+
+import sdes
+import codebook
+
+try:
+    import numpy as np
+except ImportError:  # NumPy 为可选依赖
+    np = None
+
+HAVE_NUMPY = np is not None
+
+if HAVE_NUMPY:
+    _IP = np.array(sdes._IP_TABLE, dtype=np.uint8)
+    _IP_INV = np.array(sdes._IP_INV_TABLE, dtype=np.uint8)
+    _S1 = np.array(sdes.S1, dtype=np.uint8)
+    _S2 = np.array(sdes.S2, dtype=np.uint8)
+
+
+def _require_numpy():
+    if not HAVE_NUMPY:
+        raise ImportError("vectorized 模块的数组接口需要安装 numpy")
+
+
+def _permute_bits(values, permutation, in_bits):
+    """数组版置换：对 values 中每个元素按置换表重排 in_bits 位"""
+    out = np.zeros_like(values)
+    for pos in permutation:
+        out = (out << 1) | ((values >> (in_bits - pos)) & 1)
+    return out
+
+
+def _rotl5(half, shifts):
+    return ((half << shifts) | (half >> (5 - shifts))) & 0x1F
+
+
+def subkeys(keys):
+    """批量子密钥生成：keys 为 0~1023 的数组，返回 (K1, K2) 两个 uint16 数组"""
+    _require_numpy()
+    keys = np.asarray(keys, dtype=np.uint16)
+    key_p10 = _permute_bits(keys, sdes.P10, 10)
+    left_half, right_half = key_p10 >> 5, key_p10 & 0x1F
+    k1 = _permute_bits((_rotl5(left_half, 1) << 5) | _rotl5(right_half, 1), sdes.P8, 10)
+    k2 = _permute_bits((_rotl5(left_half, 2) << 5) | _rotl5(right_half, 2), sdes.P8, 10)
+    return k1, k2
+
+
+def _s_box(segment, s_box):
+    """S-Box 查表：行为第 1、4 位，列为第 2、3 位"""
+    row = ((segment >> 2) & 2) | (segment & 1)
+    col = (segment >> 1) & 3
+    return s_box[row, col]
+
+
+def f_function(right, subkey):
+    """批量轮函数 F：E/P -> 异或 -> S-Box -> P4"""
+    expanded = _permute_bits(right, sdes.EP, 4) ^ subkey
+    s_out = (_s_box(expanded >> 4, _S1).astype(np.uint16) << 2) | _s_box(expanded & 0xF, _S2)
+    return _permute_bits(s_out, sdes.P4, 4)
+
+
+def _crypt(blocks, first, second):
+    state = _IP[blocks].astype(np.uint16)
+    left, right = state >> 4, state & 0xF
+    # 第一轮 + 交换（SW）
+    left, right = right, left ^ f_function(right, first)
+    # 第二轮（不交换）
+    left = left ^ f_function(right, second)
+    return _IP_INV[(left << 4) | right]
+
+
+def _broadcast(blocks, keys):
+    blocks = np.asarray(blocks, dtype=np.uint8)
+    keys = np.asarray(keys, dtype=np.uint16)
+    if keys.size and int(keys.max()) >= 1024:
+        raise ValueError("密钥必须在 0~1023 之间")
+    return np.broadcast_arrays(blocks, keys)
+
+
+def encrypt(blocks, keys):
+    """批量加密：blocks（uint8）与 keys（uint16）广播后逐元素加密，返回 uint8 数组"""
+    _require_numpy()
+    blocks, keys = _broadcast(blocks, keys)
+    k1, k2 = subkeys(keys)
+    return _crypt(blocks, k1, k2)
+
+
+def decrypt(blocks, keys):
+    """批量解密：子密钥顺序为 K2、K1"""
+    _require_numpy()
+    blocks, keys = _broadcast(blocks, keys)
+    k1, k2 = subkeys(keys)
+    return _crypt(blocks, k2, k1)
+
+
+def all_keys():
+    """全部 1024 个密钥（uint16 数组）"""
+    _require_numpy()
+    return np.arange(1024, dtype=np.uint16)
+
+
+def codebook_matrix():
+    """全部明文 × 全部密钥的密文矩阵，形状 (1024, 256)"""
+    _require_numpy()
+    return encrypt(np.arange(256, dtype=np.uint8)[None, :], all_keys()[:, None])
+
+
+def encrypt_all_keys(block):
+    """同一明文在全部 1024 个密钥下的密文，下标即密钥"""
+    if HAVE_NUMPY:
+        return encrypt(block, all_keys())
+    return bytes(codebook.encrypt_codebook()[block::256])
+
+
+def keys_matching(pairs):
+    """返回使所有 (明文, 密文) 整数对都成立的密钥列表（升序）"""
+    if HAVE_NUMPY:
+        mask = np.ones(1024, dtype=bool)
+        for pt, ct in pairs:
+            mask &= encrypt_all_keys(pt) == ct
+        return np.flatnonzero(mask).tolist()
+    table = codebook.encrypt_codebook()
+    return [k for k in range(1024) if all(table[(k << 8) | pt] == ct for pt, ct in pairs)]